@@ -18,6 +18,10 @@
 #
 #===============================================================================
 
+from typing import TYPE_CHECKING
+
+#===============================================================================
+
 from .__version__ import __version__
 
 #===============================================================================
@@ -36,6 +40,17 @@ ZOOM_OFFSET_FROM_BASE = 2
 
 #===============================================================================
 
-from .maker import MapMaker
+# ``MapMaker``, and so all of mapmaker's dependencies, are only imported
+# when first used, so that ``mapmaker --help`` and ``--version`` start quickly
+
+if TYPE_CHECKING:
+    from .maker import MapMaker
+
+def __getattr__(name: str):
+    if name == 'MapMaker':
+        from .maker import MapMaker
+        globals()[name] = MapMaker
+        return MapMaker
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 #===============================================================================
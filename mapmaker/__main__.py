@@ -22,8 +22,10 @@ import argparse
 
 #===============================================================================
 
-from mapmaker import MapMaker, __version__
-from mapmaker.utils import log
+# Only mapmaker's version is imported before arguments are parsed; the
+# rest of mapmaker, and its dependencies, are imported when making a map
+
+from mapmaker import __version__
 
 #===============================================================================
 
@@ -65,6 +67,10 @@ def arg_parser():
                         help="Don't do `TransitMap` optimisation of paths")
     generation_options.add_argument('--publish', metavar='SPARC_DATASET',
                         help="Create a SPARC Dataset containing the map's sources and the generated map")
+    generation_options.add_argument('--route-processes', dest='routeProcesses', metavar='N', type=int,
+                        help="Number of processes used to route paths (defaults to the number of CPUs)")
+    generation_options.add_argument('--slide-processes', dest='slideProcesses', metavar='N', type=int,
+                        help="Number of processes used to get the shapes of Powerpoint slides (defaults to the number of CPUs)")
     generation_options.add_argument('--sckan-version', dest='sckanVersion', choices=['production', 'staging'],
                         help="Overide version of SCKAN specified by map's manifest")
 
@@ -75,6 +81,8 @@ def arg_parser():
                         help='See `log.debug()` messages in log')
     debug_options.add_argument('--only-networks', dest='onlyNetworks', action='store_true',
                         help='Only output features that are part of a centreline network')
+    debug_options.add_argument('--profile-memory', dest='profileMemory', action='store_true',
+                        help='Trace Python memory allocation when profiling map making (slows making)')
     debug_options.add_argument('--save-drawml', dest='saveDrawML', action='store_true',
                         help="Save a slide's DrawML for debugging")
     debug_options.add_argument('--save-geojson', dest='saveGeoJSON', action='store_true',
@@ -123,6 +131,8 @@ def main():
     args = parser.parse_args()
     if not args.pathLayout:
         args.noPathLayout = True
+    from mapmaker import MapMaker
+    from mapmaker.utils import log
     try:
         mapmaker = MapMaker({k:v for k, v in vars(args).items() if not (v is None or isinstance(v, bool) and v == False)})
         mapmaker.make()
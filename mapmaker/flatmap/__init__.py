@@ -21,7 +21,8 @@
 from collections import defaultdict, OrderedDict
 from datetime import datetime, timezone
 import os
-from typing import Optional, TYPE_CHECKING
+import time
+from typing import Any, Optional, TYPE_CHECKING
 
 #===============================================================================
 
@@ -39,7 +40,7 @@ from mapmaker.knowledgebase import AnatomicalNode, get_knowledge
 from mapmaker.knowledgebase.sckan import SckanNeuronPopulations
 from mapmaker.properties import ConnectionSet, PropertiesStore
 from mapmaker.settings import MAP_KIND, settings
-from mapmaker.utils import log
+from mapmaker.utils import log, profile_count, profile_span
 
 from .feature import Feature, FeatureAnatomicalNodeMap
 from .layers import FEATURES_TILE_LAYER, MapLayer
@@ -78,6 +79,7 @@ class FlatMap(object):
         self.__sckan_neuron_populations = SckanNeuronPopulations(self)
         self.__layer_dict: OrderedDict[str, MapLayer] = OrderedDict()
         self.__bottom_exported_layer: Optional[MapLayer] = None
+        self.__pathway_line_features: Optional[list[Feature]] = None
 
     def __len__(self):
         return self.__visible_layer_count
@@ -146,6 +148,20 @@ class FlatMap(object):
     def min_zoom(self):
         return self.__min_zoom
 
+    @property
+    def pathway_line_features(self) -> list[Feature]:
+        """
+        Line features of exported layers in the pathways tile layer.
+
+        Features are collected on first use, after the map has been closed.
+        """
+        if self.__pathway_line_features is None:
+            self.__pathway_line_features = [feature for layer in self.__layer_dict.values() if layer.exported
+                                                for feature in layer.features
+                                                    if (feature.properties.get('tile-layer') == PATHWAYS_TILE_LAYER
+                                                    and 'Line' in feature.properties['geometry'])]
+        return self.__pathway_line_features
+
     @property
     def properties_store(self):
         return self.__properties_store
@@ -212,6 +228,7 @@ class FlatMap(object):
         self.__features_with_name: dict[str, Feature] = {}
         self.__last_geojson_id = 0
         self.__features_by_geojson_id: dict[int, Feature] = {}
+        self.__proxy_features_by_model: defaultdict[str, set[Feature]] = defaultdict(set)
         self.__associated_layers: defaultdict[str, list[int]] = defaultdict(list)
 
         # Used to find annotated features containing a region
@@ -232,7 +249,9 @@ class FlatMap(object):
 
         if not settings.get('ignoreSckan', False):
             # Generate connectivity and associated metadata
-            self.__generate_connectivity()
+            with profile_span('connectivity'):
+                self.__generate_connectivity()
+                profile_count('paths', len(self.connectivity().get('paths', {})))
         # Set creation time
         self.__created = datetime.now(tz=timezone.utc)
         self.__metadata['created'] = self.__created.isoformat(timespec='seconds')
@@ -245,15 +264,19 @@ class FlatMap(object):
     #========================================================
         if self.__feature_node_map is not None:
             self.__feature_node_map.add_feature(feature)
+            # So that lookups aren't made with a feature's old geometry
+            if feature.property_listener is None:
+                feature.property_listener = self.__feature_property_changed
 
     def features_for_anatomical_node(self, anatomical_node: AnatomicalNode, warn: bool=True) -> Optional[tuple[AnatomicalNode, set[Feature]]]:
     #=========================================================================================================================================
         if self.__feature_node_map is not None:
             if len((features:=self.__feature_node_map.features_for_anatomical_node(anatomical_node, warn=warn))[1]) > 0:
                 return features
-            if len(fts:=set(feature for feature in self.__features_with_id.values()
-                            if feature.models in [features[0][0]]+list(features[0][1])
-                            and feature.get_property('kind')=='proxy')) > 0:
+            fts = set()
+            for model in [features[0][0]] + list(features[0][1]):
+                fts.update(self.__proxy_features_by_model.get(model, ()))
+            if len(fts) > 0:
                 for f in fts:
                     f.add_anatomical_node(anatomical_node)
                 return (features[0], fts)
@@ -294,8 +317,11 @@ class FlatMap(object):
         self.__last_geojson_id += 1
         feature = Feature(self.__last_geojson_id, geometry, properties, is_group=is_group)
         self.__features_by_geojson_id[feature.geojson_id] = feature
+        profile_count('features')
         if feature.id and (not properties.get('group', False) or is_group):
             self.__features_with_id[feature.id] = feature
+            self.__index_proxy_feature(feature)
+            feature.property_listener = self.__feature_property_changed
         if self.map_kind == MAP_KIND.FUNCTIONAL:
             if (name := properties.get('name', '')) != '':
                 self.__features_with_name[f'{layer_id}/{name.replace(" ", "_")}'] = feature
@@ -304,6 +330,24 @@ class FlatMap(object):
                 self.__associated_layers[layer].append(feature.geojson_id)
         return feature
 
+    def __index_proxy_feature(self, feature: Feature):
+    #=================================================
+        if feature.get_property('kind') == 'proxy' and isinstance(models := feature.models, str):
+            self.__proxy_features_by_model[models].add(feature)
+
+    def __feature_property_changed(self, feature: Feature, key: str, old_value: Any):
+    #================================================================================
+        if key == 'geometry':
+            if self.__feature_node_map is not None:
+                self.__feature_node_map.feature_geometry_changed(feature)
+        # Keep the index of proxy features in step with their ``kind`` and ``models``
+        elif key in ['kind', 'models']:
+            old_kind = old_value if key == 'kind' else feature.get_property('kind')
+            old_models = old_value if key == 'models' else feature.models
+            if old_kind == 'proxy' and isinstance(old_models, str):
+                self.__proxy_features_by_model[old_models].discard(feature)
+            self.__index_proxy_feature(feature)
+
     def network_feature(self, feature: Feature) -> bool:
     #===================================================
         return self.__properties_store.network_feature(feature)
@@ -537,12 +581,16 @@ class FlatMap(object):
                                         min_zoom=minzoom, local_world_to_base=transform)
 
             # The detail layer gets a scaled copy of each high-resolution feature
-            for hires_feature in hires_layer.features:
+            start_time = time.perf_counter()
+            hires_features = hires_layer.features
+            hires_geometries = transform.transform_geometries([hires_feature.geometry for hires_feature in hires_features])
+            for hires_feature, geometry in zip(hires_features, hires_geometries):
                 new_feature = self.__new_detail_feature(layer.id, detail_layer, minzoom,
-                                                        transform.transform_geometry(hires_feature.geometry),
-                                                        hires_feature.properties)
+                                                        geometry, hires_feature.properties)
                 if new_feature is not None and new_feature.has_property('details'):
                     extra_details.append(new_feature)
+            log.info('Added detail features', layer=hires_layer.id, features=len(hires_features),
+                     time=f'{time.perf_counter() - start_time:.2f}s')
 
         # If hires features that we've just added also have details then add them
         # to the detail layer
@@ -19,10 +19,14 @@
 #===============================================================================
 
 from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 import json
 import typing
 from typing import Any, Optional, TYPE_CHECKING
 
+import numpy as np
+import shapely
 from shapely.geometry.base import BaseGeometry
 import structlog
 
@@ -43,6 +47,9 @@ EXCLUDE_PROPERTIES_FROM_STR = [
     'svg-element'
 ]
 
+#! Called with a feature, the key of a changed property and the property's previous value
+type PropertyListener = Callable[['Feature', str, Any], None]
+
 class Feature(PropertyMixin):
     def __init__(self, geojson_id: int,
                        geometry: BaseGeometry,
@@ -56,6 +63,7 @@ class Feature(PropertyMixin):
         self.properties['geometry'] = geometry.geom_type
         self.__is_group = is_group
         self.__layer = None
+        self.__property_listener: Optional[PropertyListener] = None
 
     def __eq__(self, other):
         return isinstance(other, Feature) and self.__geojson_id == other.__geojson_id
@@ -91,7 +99,11 @@ class Feature(PropertyMixin):
 
     @geometry.setter
     def geometry(self, geometry: BaseGeometry):
+        old_geometry = self.__geometry
         self.__geometry = geometry
+        # Listeners are told of a new geometry as a change to a ``geometry`` property
+        if self.__property_listener is not None:
+            self.__property_listener(self, 'geometry', old_geometry)
 
     @property
     def id(self) -> Optional[str]:
@@ -113,6 +125,30 @@ class Feature(PropertyMixin):
     def models(self) -> Optional[str]:
         return self.get_property('models')
 
+    @property
+    def property_listener(self) -> Optional[PropertyListener]:
+        return self.__property_listener
+
+    @property_listener.setter
+    def property_listener(self, listener: Optional[PropertyListener]):
+        self.__property_listener = listener
+
+    def pop_property(self, key: str, default: Any=None) -> Any:
+    #==========================================================
+        value = super().pop_property(key, default)
+        if self.__property_listener is not None:
+            self.__property_listener(self, key, value)
+        return value
+
+    def set_property(self, key: str, value: Any) -> None:
+    #====================================================
+        if self.__property_listener is None or value is None:
+            super().set_property(key, value)
+        else:
+            old_value = self.get_property(key)
+            super().set_property(key, value)
+            self.__property_listener(self, key, old_value)
+
     def visible(self) -> bool:
         return not self.get_property('invisible')
 
@@ -134,29 +170,56 @@ class FeatureAnatomicalNodeMap:
                     else:
                         self.__anatomical_aliases[alias] = term
         self.__model_to_features: dict[str|tuple, set[Feature]] = defaultdict(set)
+        self.__term_indexes: dict[str|tuple, TermIndex] = {}
+        self.__matched_nodes: dict[tuple, MatchedNode] = {}
 
     def add_feature(self, feature: Feature):
     #=======================================
         if feature.models is not None:
             self.__model_to_features[feature.models].add(feature)
+            self.__term_indexes.pop(feature.models, None)
+            self.__matched_nodes.clear()
+
+    def feature_geometry_changed(self, feature: Feature):
+    #===================================================
+        # A term's index has the prepared geometries and centroids of its features
+        if feature.models is not None and self.__term_indexes.pop(feature.models, None) is not None:
+            self.__matched_nodes.clear()
+
+    def __term_index(self, term: str|tuple) -> 'TermIndex':
+    #======================================================
+        term = self.__anatomical_aliases.get(term, term)
+        if (term_index := self.__term_indexes.get(term)) is None:
+            term_index = TermIndex(self.__model_to_features.get(term, []))
+            self.__term_indexes[term] = term_index
+        return term_index
 
     def features_for_anatomical_node(self, anatomical_node: AnatomicalNode, warn: bool=False) -> tuple[AnatomicalNode, set[Feature]]:
     #================================================================================================================================
-        def features_from_anatomical_id(term: str|tuple) -> set[Feature]:
-            return set(self.__model_to_features.get(self.__anatomical_aliases.get(term, term), []))
-        def save_anatomical_node(features):
-            for feature in features:
-                feature.add_anatomical_node(anatomical_node)
-
         if anatomical_node in self.__anatomical_aliases:
             anatomical_node = AnatomicalNode(self.__anatomical_aliases[anatomical_node])
+        node_key = (anatomical_node[0], tuple(anatomical_node[1]))
+        if (matched := self.__matched_nodes.get(node_key)) is None:
+            matched = self.__match_anatomical_node(anatomical_node)
+            self.__matched_nodes[node_key] = matched
+        if warn:
+            for (message, kwds) in matched.warnings:
+                self.__log.warning(message, **kwds)
+        for feature in matched.features:
+            feature.add_anatomical_node(anatomical_node)
+        return (matched.node, set(matched.features))
+
+    def __match_anatomical_node(self, anatomical_node: AnatomicalNode) -> 'MatchedNode':
+    #===================================================================================
+        def features_from_anatomical_id(term: str|tuple) -> set[Feature]:
+            return set(self.__term_index(term).features)
 
+        warnings = []
         anatomical_id = anatomical_node[0]
         features = features_from_anatomical_id(anatomical_id)
         layers = list(anatomical_node[1])
         if len(layers) == 0:
-            save_anatomical_node(features)
-            return (anatomical_node, features)
+            return MatchedNode(anatomical_node, features, warnings)
 
         # Remove any nerve features from the anatomical node's layers
         # And filter out any layer that has no features
@@ -172,43 +235,35 @@ class FeatureAnatomicalNodeMap:
 
         # Look for a substitute feature if we can't find the base term
         matched_node = AnatomicalNode([anatomical_id, anatomical_layers])
+        feature_term = anatomical_id
         if len(features) == 0:
             while len(anatomical_layers) > 0:
                 substitute_id = anatomical_layers.pop(0)
                 features = features_from_anatomical_id(substitute_id)
                 if len(features):
-                    if warn:
-                        self.__log.warning('Cannot find feature for entity, substituted containing region',
-                                        name=entity_name(anatomical_id), entity=anatomical_id,
-                                        substitute=entity_name(substitute_id))
+                    warnings.append(('Cannot find feature for entity, substituted containing region',
+                                    {'name': entity_name(anatomical_id), 'entity': anatomical_id,
+                                     'substitute': entity_name(substitute_id)}))
                     matched_node = AnatomicalNode([substitute_id, anatomical_layers])
+                    feature_term = substitute_id
                     break
         if len(anatomical_layers) == 0:
-            save_anatomical_node(features)
-            return (matched_node, features)
+            return MatchedNode(matched_node, features, warnings)
 
-        # Restrict found features to those contained in specified layers
+        # Restrict found features to those whose centroid is contained in
+        # a feature of one of the specified layers
+        feature_index = self.__term_index(feature_term)
         matched_features = set()
-        for feature in features:
-            feature_in_layers = False
-            for anatomical_layer in anatomical_layers:
-                feature_in_layer = False
-                for layer_feature in features_from_anatomical_id(anatomical_layer):
-                    if layer_feature.geometry.contains(feature.geometry.centroid):
-                        feature_in_layer = True
-                        break
-                if feature_in_layer:
-                    feature_in_layers = True
-                    break
-            if feature_in_layers:
-                matched_features.add(feature)
+        for anatomical_layer in anatomical_layers:
+            layer_index = self.__term_index(anatomical_layer)
+            if len(layer_index.features) and len(feature_index.features):
+                (_, centroid_indices) = feature_index.centroid_tree.query(layer_index.geometries, predicate='contains')
+                matched_features.update(feature_index.features[index] for index in centroid_indices)
         if len(matched_features) == 0 and len(features) == 1:
             matched_features = features
-            if warn:
-                self.__log.warning(f'Feature is not in expected layers', feature=matched_node.full_name)
+            warnings.append(('Feature is not in expected layers', {'feature': matched_node.full_name}))
 
-        save_anatomical_node(matched_features)
-        return (matched_node, matched_features)
+        return MatchedNode(matched_node, matched_features, warnings)
 
     def get_features(self, model: str) -> set[Feature]:
     #==================================================
@@ -219,3 +274,44 @@ class FeatureAnatomicalNodeMap:
         return model in self.__model_to_features
 
 #===============================================================================
+
+class TermIndex:
+    """
+    The features that model an anatomical term, with their prepared geometries
+    and a spatial index of their centroids, for layer containment tests.
+
+    An index is discarded when the geometry of one of its features changes.
+    """
+    def __init__(self, features: Iterable[Feature]):
+        self.__features = list(features)
+        self.__geometries: Optional[np.ndarray] = None
+        self.__centroid_tree: Optional[shapely.STRtree] = None
+
+    @property
+    def features(self) -> list[Feature]:
+        return self.__features
+
+    @property
+    def centroid_tree(self) -> shapely.STRtree:
+        if self.__centroid_tree is None:
+            self.__centroid_tree = shapely.STRtree(shapely.centroid(self.__feature_geometries()))
+        return self.__centroid_tree
+
+    @property
+    def geometries(self) -> np.ndarray:
+        if self.__geometries is None:
+            self.__geometries = self.__feature_geometries()
+            shapely.prepare(self.__geometries)
+        return self.__geometries
+
+    def __feature_geometries(self) -> np.ndarray:
+    #============================================
+        return np.array([feature.geometry for feature in self.__features], dtype=object)
+
+@dataclass
+class MatchedNode:
+    node: AnatomicalNode
+    features: set[Feature]
+    warnings: list[tuple[str, dict[str, Any]]]
+
+#===============================================================================
@@ -18,14 +18,14 @@
 #
 #===============================================================================
 
-from typing import TYPE_CHECKING, Optional
+from typing import IO, TYPE_CHECKING, Optional
 
 #===============================================================================
 
+import numpy as np
 import shapely
 from shapely.geometry.base import BaseGeometry
 import shapely.ops
-import shapely.prepared
 
 #===============================================================================
 
@@ -50,6 +50,18 @@ PATHWAYS_TILE_LAYER = 'pathways'
 
 #===============================================================================
 
+def feature_geometry_parts(features: list[Feature], geom_types: list[str]) -> np.ndarray:
+#========================================================================================
+    # The parts of the geometries of features having one of ``geom_types``, in feature order
+    geometries = np.array([feature.geometry for feature in features], dtype=object)
+    if len(geometries) == 0:
+        return geometries
+    geometries = geometries[np.isin(shapely.get_type_id(geometries),
+                                    [shapely.GeometryType[geom_type.upper()] for geom_type in geom_types])]
+    return shapely.get_parts(geometries)
+
+#===============================================================================
+
 class FeatureLayer(object):
     def __init__(self, id: str, flatmap: 'FlatMap', exported: bool=False):
         self.__id = id
@@ -398,38 +410,41 @@ class MapLayer(FeatureLayer):
 
                 polygons = list(shapely.ops.polygonize(polygon_boundaries))
 
+                # Label each polygon with the first region it contains
+                region_tree = shapely.STRtree([region.geometry for region in regions])
+                (polygon_indices, region_indices) = region_tree.query(np.array(polygons, dtype=object), predicate='contains')
+                polygon_regions = np.full(len(polygons), len(regions))
+                np.minimum.at(polygon_regions, polygon_indices, region_indices)
+
                 for n, polygon in enumerate(polygons):
                     if debug_group:
                         save_geometry(polygon, f'polygon_{n}.wkt')
-                    prepared_polygon = shapely.prepared.prep(polygon)
-                    region_properties = base_properties.copy()
-                    # So that any region doesn't have a duplicate id
-                    region_properties.pop('id', None)
-                    region_properties.pop('userdata', None)
-                    for region in filter(lambda p: prepared_polygon.contains(p.geometry), regions):
-                        region_properties.update(region.properties)
+                    if polygon_regions[n] < len(regions):
+                        region_properties = base_properties.copy()
+                        # So that any region doesn't have a duplicate id
+                        region_properties.pop('id', None)
+                        region_properties.pop('userdata', None)
+                        region_properties.update(regions[polygon_regions[n]].properties)
                         feature = self.flatmap.new_feature(self.id, polygon, region_properties)
                         if feature is not None:
                             layer_features.append(feature)
-                        break
         else:
             for feature in features:
                 if feature.get_property('region'):
                     raise ValueError('Region dividers in group {} must have a boundary: {}'.format(group_name, feature))
 
         if not outermost and interior_features:
-            interior_polygons = []
-            for feature in interior_features:
-                if feature.geom_type == 'Polygon':
-                    interior_polygons.append(feature.geometry)
-                elif feature.geom_type == 'MultiPolygon':
-                    interior_polygons.extend(list(feature.geometry.geoms))
-            interior_polygon = shapely.ops.unary_union(interior_polygons)
-            for feature in layer_features:
-                if (feature.has_property('markup')
-                and feature.get_property('exterior')
-                and feature.geom_type in ['Polygon', 'MultiPolygon']):
-                    feature.geometry = feature.geometry.buffer(0).difference(interior_polygon)
+            interior_polygon = shapely.ops.unary_union(feature_geometry_parts(interior_features, ['Polygon', 'MultiPolygon']))
+            exterior_features = [feature for feature in layer_features
+                                    if (feature.has_property('markup')
+                                    and feature.get_property('exterior')
+                                    and feature.geom_type in ['Polygon', 'MultiPolygon'])]
+            if len(exterior_features):
+                exterior_geometries = shapely.difference(
+                    shapely.buffer(np.array([feature.geometry for feature in exterior_features], dtype=object), 0),
+                    interior_polygon)
+                for feature, geometry in zip(exterior_features, exterior_geometries):
+                    feature.geometry = geometry
 
         # Construct a MultiPolygon containing all of the group's polygons
         # But only if the group contained a `.group` element...
@@ -438,32 +453,23 @@ class MapLayer(FeatureLayer):
             grouped_polygon_features = []
             grouped_polygon_features.extend(layer_features)
 
-            grouped_polygons = []
-            for feature in grouped_polygon_features:
-                if feature.geom_type == 'Polygon':
-                    grouped_polygons.append(feature.geometry)
-                elif feature.geom_type == 'MultiPolygon':
-                    grouped_polygons.extend(list(feature.geometry.geoms))       # type: ignore
+            grouped_polygons = feature_geometry_parts(grouped_polygon_features, ['Polygon', 'MultiPolygon'])
             if len(grouped_polygons):
                 feature_group = self.flatmap.new_feature(
                         self.id,
-                        shapely.MultiPolygon(grouped_polygons).buffer(0),
+                        shapely.MultiPolygon(list(grouped_polygons)).buffer(0),
                         grouped_properties, is_group=True)
                 if feature_group is not None:
                     layer_features.append(feature_group)
 
-            grouped_lines = []
-            for feature in grouped_polygon_features:
-                if feature.get_property('tile-layer') != PATHWAYS_TILE_LAYER:
-                    if feature.geom_type == 'LineString':
-                        grouped_lines.append(feature.geometry)
-                    elif feature.geom_type == 'MultiLineString':
-                        grouped_lines.extend(list(feature.geometry.geoms))      # type: ignore
+            grouped_lines = feature_geometry_parts([feature for feature in grouped_polygon_features
+                                                        if feature.get_property('tile-layer') != PATHWAYS_TILE_LAYER],
+                                                   ['LineString', 'MultiLineString'])
             if len(grouped_lines):  ## should polygons take precedence over lines???
                                     ## at least for assigning ID...
                 feature_group = self.flatmap.new_feature(
                       self.id,
-                      shapely.MultiLineString(grouped_lines),
+                      shapely.MultiLineString(list(grouped_lines)),
                       grouped_properties, is_group=True)
                 if feature_group is not None:
                     layer_features.append(feature_group)
@@ -546,7 +552,7 @@ class RasterLayer(object):
         return self.__min_zoom
 
     @property
-    def source_data(self) -> bytes:
+    def source_data(self) -> bytes|IO[bytes]:
         return self.__raster_source.data
 
     @property
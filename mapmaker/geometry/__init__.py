@@ -19,7 +19,7 @@
 #===============================================================================
 
 from math import acos, cos, sin, sqrt, pi as PI
-from typing import Self
+from typing import Optional, Self
 import warnings
 
 #===============================================================================
@@ -28,6 +28,7 @@ import numpy as np
 
 import pyproj
 
+import shapely
 import shapely.affinity
 import shapely.geometry
 from shapely.geometry.base import BaseGeometry
@@ -195,6 +196,25 @@ class Transform(object):
     #====================================================================
        return shapely.affinity.affine_transform(geometry, self.__shapely_matrix)
 
+    def transform_geometries(self, geometries: list[BaseGeometry]) -> list[BaseGeometry]:
+    #====================================================================================
+        """
+        Transform geometries in a single pass over all of their coordinates.
+
+        The result is the same as calling :meth:`transform_geometry` for each geometry.
+        """
+        (a, b, d, e, xoff, yoff) = self.__shapely_matrix
+        def affine_coords(coords):
+            (x, y) = coords.T
+            return np.stack([a*x + b*y + xoff, d*x + e*y + yoff]).T
+        geometry_array = np.array(geometries, dtype=object)
+        has_z = shapely.has_z(geometry_array)
+        transformed = np.empty(len(geometry_array), dtype=object)
+        transformed[~has_z] = shapely.transform(geometry_array[~has_z], affine_coords)
+        for index in np.flatnonzero(has_z):
+            transformed[index] = self.transform_geometry(geometry_array[index])
+        return transformed.tolist()
+
     def transform_point(self, point) -> tuple[float, float]:
     #=======================================================
         return tuple(self.__matrix@[point[0], point[1], 1.0])[:2]
@@ -300,13 +320,15 @@ def make_boundary(lines):
     line_matcher = LineMatcher(lines[0])
     remainder = lines[1:]
     while len(remainder) > 0:
-        for (n, line) in enumerate(remainder):
-            if line_matcher.extend(line):
+        # Only lines within ``ALMOST_TOUCHING`` of the previous line can extend it
+        neighbours = np.flatnonzero(shapely.dwithin(line_matcher.previous,
+                                                    np.array(remainder, dtype=object), ALMOST_TOUCHING))
+        for n in neighbours:
+            if line_matcher.extend(remainder[n]):
                 del remainder[n]
                 break
-            else:
-                if n == (len(remainder) - 1):
-                    raise ValueError("Boundary segment doesn't have a close neighbour")
+        else:
+            raise ValueError("Boundary segment doesn't have a close neighbour")
     if line_matcher.extend(lines[0]):
         coords = line_matcher.coords
         if coords[0] != coords[-1]:
@@ -338,11 +360,26 @@ def endpoint(point, line):
 #===============================================================================
 
 def connect_dividers(dividers, debug):
+    # Dividers are only changed, or connected, when they are within ``ALMOST_TOUCHING``
+    # of each other. Extending a divider only adds to it, so an index of the original
+    # dividers finds all the neighbours of a divider, except for extended dividers which
+    # are checked directly.
+    divider_index = shapely.STRtree(dividers)
+    extended_dividers = set()
+    def next_neighbour(n: int, m: int) -> Optional[int]:
+        divider = dividers[n]
+        neighbours = [int(k) for k in divider_index.query(divider, predicate='dwithin', distance=ALMOST_TOUCHING)
+                        if k > m]
+        neighbours.extend(k for k in extended_dividers
+                            if k > m and divider.distance(dividers[k]) <= ALMOST_TOUCHING)
+        return min(neighbours, default=None)
+
     connectors = []
     for n in range(len(dividers) - 1):
-        divider1 = dividers[n]
-        for m in range(n + 1, len(dividers)):
-            divider2 = dividers[m]
+        m = n
+        while (m := next_neighbour(n, m)) is not None:
+            divider1_start = divider1 = dividers[n]
+            divider2_start = divider2 = dividers[m]
             if divider1.boundary.is_empty and divider2.boundary.is_empty:
                 nearest = shapely.ops.nearest_points(divider1, divider2)
                 distance = nearest[0].distance(nearest[1])
@@ -426,6 +463,10 @@ def connect_dividers(dividers, debug):
                         dividers[m] = extend_divider(divider2, nearest[0], nearest[1])
                         divider2 = dividers[m]
                         if debug: print(n, m, 'no rings: extend 2nd end...')
+            if dividers[n] is not divider1_start:
+                extended_dividers.add(n)
+            if dividers[m] is not divider2_start:
+                extended_dividers.add(m)
     return dividers + connectors
 
 #===============================================================================
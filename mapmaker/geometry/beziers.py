@@ -18,6 +18,8 @@
 #
 #===============================================================================
 
+from functools import lru_cache
+import math
 from typing import Optional
 
 #===============================================================================
@@ -68,17 +70,129 @@ def width_along_line(geometry: BaseGeometry, point: BezierPoint, dirn: BezierPoi
 
 #===============================================================================
 
+# Vectorised evaluation of Bezier segments and paths. A segment's control points
+# are held in a ``(4, 2)`` array, padded for lines and quadratic curves, along
+# with the segment's degree. Evaluation follows the arithmetic of ``beziers`` so
+# that sampled points are identical to those of ``pointAtTime()``.
+
+def __segment_arrays(bz: BezierPath|BezierSegment) -> tuple[np.ndarray, np.ndarray]:
+#===================================================================================
+    segments = bz.asSegments() if isinstance(bz, BezierPath) else [bz]
+    controls = np.zeros((len(segments), 4, 2))
+    degrees = np.empty(len(segments), dtype=int)
+    for n, segment in enumerate(segments):
+        degree = len(segment.points) - 1
+        if degree < 1 or degree > 3:
+            raise ValueError(f'Unsupported Bezier segment of degree {degree}')
+        controls[n, :degree+1] = [(pt.x, pt.y) for pt in segment.points]
+        degrees[n] = degree
+    return (controls, degrees)
+
+def __bernstein(p: np.ndarray, degree: int, s: np.ndarray) -> np.ndarray:
+#========================================================================
+    # Evaluate with the same arithmetic as ``pointAtTime()`` of ``beziers`` segments
+    ms = 1 - s
+    if degree < 0:
+        return np.zeros(s.shape[:-1] + (2,))
+    elif degree == 0:
+        return p[..., 0, :] + 0*s
+    elif degree == 1:
+        return p[..., 0, :]*ms + p[..., 1, :]*s
+    elif degree == 2:
+        return ms*ms*p[..., 0, :] + 2*ms*s*p[..., 1, :] + s*s*p[..., 2, :]
+    else:
+        return (ms*ms*ms*p[..., 0, :] + 3*ms*ms*s*p[..., 1, :]
+              + 3*ms*s*s*p[..., 2, :] + s*s*s*p[..., 3, :])
+
+def __segment_points(controls: np.ndarray, degrees: np.ndarray,
+                     index: np.ndarray, t: np.ndarray, derivative: int=0) -> np.ndarray:
+#=====================================================================================
+    # Points (or their derivatives) on segments ``index`` at local times ``t``
+    points = np.empty(t.shape + (2,))
+    segment_degrees = degrees[index]
+    for degree in np.unique(segment_degrees):
+        selected = (segment_degrees == degree)
+        p = controls[index[selected]][..., :degree+1, :]
+        scale = 1
+        for order in range(derivative):
+            p = np.diff(p, axis=-2)
+            scale *= (degree - order)
+        points[selected] = scale*__bernstein(p, degree - derivative, t[selected][..., np.newaxis])
+    return points
+
+def __path_times(num_segments: int, times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+#=======================================================================================
+    # Map path times to segment indices and local segment times, as ``BezierPath.pointAtTime()``
+    if num_segments == 1:
+        return (np.zeros(times.shape, dtype=int), times)
+    scaled = times*num_segments
+    index = np.floor(scaled).astype(int)
+    local_times = scaled - index
+    at_end = (times == 1.0) | (index >= num_segments)
+    index[at_end] = num_segments - 1
+    local_times[at_end] = 1.0
+    return (index, local_times)
+
+@lru_cache
+def __sample_times(num_points: int) -> np.ndarray:
+#=================================================
+    # The times used by ``beziers`` ``sample()``, including its accumulated rounding
+    step = 1.0/float(num_points)
+    t = 0.0
+    times = []
+    while t <= 1.0:
+        times.append(t)
+        t += step
+    if t != 1.0:
+        times.append(1.0)
+    sample_times = np.array(times)
+    sample_times.flags.writeable = False
+    return sample_times
+
+def __sample_points(bz: BezierPath|BezierSegment, num_points: int, derivatives: int=0) -> list[np.ndarray]:
+#=======================================================================================================
+    (controls, degrees) = __segment_arrays(bz)
+    (index, local_times) = __path_times(len(degrees), __sample_times(num_points))
+    return [__segment_points(controls, degrees, index, local_times, derivative)
+                for derivative in range(derivatives + 1)]
+
+# Maximum angle between the normals at adjacent sample points for a curve to
+# be considered smooth enough to offset analytically
+MAX_NORMAL_ANGLE_STEP = math.radians(10)
+
+def __analytic_offset(points: np.ndarray, first: np.ndarray, second: np.ndarray, offset: float) -> Optional[LineString]:
+#======================================================================================================================
+    # Offset sampled points along the curve's left normal. ``None`` is returned
+    # when the curve has a corner or a radius of curvature on the offset side
+    # smaller than the offset, as the parallel curve then has cusps or loops
+    lengths = np.hypot(first[:, 0], first[:, 1])
+    if not np.all(lengths > 0.0):
+        return None
+    normals = np.column_stack((-first[:, 1], first[:, 0]))/lengths[:, np.newaxis]
+    if np.any(np.sum(normals[:-1]*normals[1:], axis=1) < math.cos(MAX_NORMAL_ANGLE_STEP)):
+        return None
+    curvature = (first[:, 0]*second[:, 1] - first[:, 1]*second[:, 0])/lengths**3
+    if np.any(curvature*offset >= 1.0):
+        return None
+    offset_line = LineString(points + offset*normals)
+    return offset_line if offset_line.is_simple else None
+
+#===============================================================================
+
 def bezier_sample(bz, num_points=100) -> list[Coordinate]:
 #=========================================================
-    return [(pt.x, pt.y) for pt in bz.sample(num_points)]
+    points = __sample_points(bz, num_points)[0]
+    return list(map(tuple, points.tolist()))
 
 def bezier_to_linestring(bz, num_points=100, offset=0) -> LineString|MultiLineString:
 #====================================================================================
-    line = LineString(bezier_sample(bz, num_points))
     if offset == 0:
-        return line
-    else:
-        return line.parallel_offset(abs(offset), 'left' if offset >= 0 else 'right')
+        return LineString(__sample_points(bz, num_points)[0])
+    (points, first, second) = __sample_points(bz, num_points, 2)
+    if (offset_line := __analytic_offset(points, first, second, offset)) is not None:
+        return offset_line
+    # Let GEOS trim the offset line
+    return LineString(points).parallel_offset(abs(offset), 'left' if offset >= 0 else 'right')
 
 #===============================================================================
 
@@ -108,29 +222,44 @@ def bezier_connect(a: BezierPoint, b: BezierPoint,
 
 #===============================================================================
 
-def closest_time_distance(bz: BezierPath|BezierSegment, pt: BezierPoint, steps: int=100) -> Coordinate:
-    def subdivide_search(t0: float, t1: float, steps: int) -> tuple[float, float, float]:
-        closest_d = -1
-        closest_t = t0
-        delta_t = (t1 - t0)/steps
-        for step in range(steps+1):
-            t = t0 + step*delta_t
-            if t > 1.0:
-                t = 1.0
-            elif t < 0.0:
-                t = 0.0
-            d = bz.pointAtTime(t).distanceFrom(pt)      # pyright: ignore[reportAttributeAccessIssue]
-            if closest_d < 0 or d < closest_d:
-                closest_t = t
-                closest_d = d
-        return (closest_t, delta_t, closest_d)
-    (t, delta_t, distance) = (0.5, 0.5, 0.0)
+def __closest_times_distances(controls: np.ndarray, degrees: np.ndarray, pt: BezierPoint,
+                              steps: int, per_segment: bool) -> tuple[np.ndarray, np.ndarray]:
+#=========================================================================================
+    # Search for the closest point to ``pt`` either on each individual segment
+    # or along the whole path, refining a grid of ``steps`` about the closest time
+    target = np.array([pt.x, pt.y])
+    count = len(degrees) if per_segment else 1
+    offsets = np.arange(steps + 1)
+    t = np.full(count, 0.5)
+    delta_t = np.full(count, 0.5)
+    distance = np.zeros(count)
+    searching = np.ones(count, dtype=bool)
     for _ in range(4):
-        (t, delta_t, distance) = subdivide_search(t - delta_t, t + delta_t, steps)
-        if distance == 0:
+        t0 = t - delta_t
+        t1 = t + delta_t
+        delta_t = np.where(searching, (t1 - t0)/steps, delta_t)
+        times = np.clip(t0[:, np.newaxis] + offsets*delta_t[:, np.newaxis], 0.0, 1.0)
+        if per_segment:
+            index = np.broadcast_to(np.arange(count)[:, np.newaxis], times.shape)
+            local_times = times
+        else:
+            (index, local_times) = __path_times(len(degrees), times)
+        delta = __segment_points(controls, degrees, index, local_times) - target
+        distances = np.sqrt(delta[..., 0]*delta[..., 0] + delta[..., 1]*delta[..., 1])
+        closest = np.argmin(distances, axis=1)
+        rows = np.arange(count)
+        t = np.where(searching, times[rows, closest], t)
+        distance = np.where(searching, distances[rows, closest], distance)
+        searching &= (distance != 0)
+        if not np.any(searching):
             break
     return (t, distance)
 
+def closest_time_distance(bz: BezierPath|BezierSegment, pt: BezierPoint, steps: int=100) -> Coordinate:
+    (controls, degrees) = __segment_arrays(bz)
+    (t, distance) = __closest_times_distances(controls, degrees, pt, steps, False)
+    return (float(t[0]), float(distance[0]))
+
 #===============================================================================
 
 def set_bezier_path_end_to_point(bz_path: BezierPath, point: BezierPoint) -> float:
@@ -149,17 +278,11 @@ def set_bezier_path_end_to_point(bz_path: BezierPath, point: BezierPoint) -> flo
 
 def split_bezier_path_at_point(bz_path: BezierPath, point: BezierPoint) -> tuple[BezierPath, BezierPath]:
     segments = bz_path.asSegments()
-    # Find segment that is closest to the point
-    closest_distance = None
-    closest_seg_index = None
-    closest_time = None
-    for n, segment in enumerate(segments):
-        if (time_distance := closest_time_distance(segment, point, 10))[0] <= 1.0:
-            if closest_distance is None or time_distance[1] < closest_distance:
-                (closest_time, closest_distance) = time_distance
-                closest_seg_index = n
-                if closest_distance == 0.0:
-                    break
+    # Find segment that is closest to the point, searching all segments at once
+    (controls, degrees) = __segment_arrays(bz_path)
+    (times, distances) = __closest_times_distances(controls, degrees, point, 10, True)
+    closest_seg_index = int(np.argmin(distances)) if len(distances) else None
+    closest_time = float(times[closest_seg_index]) if closest_seg_index is not None else None
     if (closest_seg_index is None
     or (closest_seg_index == (len(segments) - 1) and closest_time == 1.0)):
         return (bz_path,
@@ -28,6 +28,7 @@ from flatmapknowledge import KnowledgeStore
 #===============================================================================
 
 from mapmaker.settings import settings
+from mapmaker.utils.profile import profile_count
 
 #===============================================================================
 
@@ -62,6 +63,7 @@ def get_label(entity: str) -> str:
     return get_knowledge(entity).get('label', entity)
 
 def get_knowledge(entity: str) -> dict[str, Any]:
+    profile_count('knowledge-lookups')
     return settings['KNOWLEDGE_STORE'].entity_knowledge(entity)
 
 def connectivity_paths() -> list[str]:
@@ -25,13 +25,14 @@ import multiprocessing
 import multiprocessing.connection
 import shutil
 import subprocess
+import tracemalloc
 import uuid
 from typing import Any, Optional
 
 #===============================================================================
 
 from . import FLATMAP_VERSION, __version__
-from .utils import configure_logging, log, set_as_list
+from .utils import BuildProfile, configure_logging, log, profile_count, profile_span, set_as_list
 
 #===============================================================================
 
@@ -48,7 +49,6 @@ from .output.tilemaker import RasterTileMaker
 
 from .settings import settings, MAP_KIND
 
-from .sources import FCPowerpointSource, MBFSource, PowerpointSource, SVGSource
 from .shapes.shapefilter import ShapeFilter
 
 #===============================================================================
@@ -65,6 +65,12 @@ is in the process of being made
 """
 MAKER_SENTINEL = '.map_making'
 
+"""
+The timings, memory use and counts of the stages of making a map are saved
+in the generated flatmap's directory with this name
+"""
+BUILD_PROFILE = 'build-profile.json'
+
 #===============================================================================
 
 INVALID_PUBLISHING_OPTIONS = [
@@ -250,6 +256,10 @@ class MapMaker:
         # The map we are making
         self.__flatmap = FlatMap(self.__manifest, self, self.__annotator)
 
+    @property
+    def flatmap(self) -> Optional[FlatMap]:
+        return self.__flatmap
+
     @property
     def map_dir(self):
         return self.__map_dir
@@ -272,64 +282,88 @@ class MapMaker:
             log.critical('Mapmaker failed')
             return
 
-        self.__begin_make()
-
-        # Process flatmap's sources to create MapLayers
-        base_source = self.__process_sources()
-
-        # Finish flatmap processing (path routing, etc)
-        self.__flatmap.close()
-
-        # Do we have any map layers?
-        if len(self.__flatmap) == 0:
-            raise ValueError('No map layers in sources...')
-
-        # Save annotation
-        if self.__annotator is not None:
-            self.__annotator.save()
-
-        # Output all features (as GeoJSON) and optionally, their identifiers
-        self.__output_features()
-
-        # Generate vector tiles from GeoJSON
-        self.__make_vector_tiles()
-
-        # Generate image tiles as required
-        self.__check_raster_tiles()
-
-        # Save an SVG preview in the output directory
-        if base_source is not None:
-            self.__create_preview(base_source)
-
-        # Save the flatmap's metadata
-        self.__save_metadata()
-
-        # We now have successfully generated the flatmap
-        generated_map = {'id': self.__id, 'uuid': self.uuid, 'path': self.__map_dir}
-        if self.__flatmap.models is not None:
-            generated_map['models'] = self.__flatmap.models
-        log.info('Generated map', **generated_map)
-        log.critical('Mapmaker succeeded', **generated_map)
-
-        # Write out details of FC neurons if option set
-        if (export_file := settings.get('exportNeurons')) is not None:
-            with open(export_file, 'w') as fp:
-                fp.write(json.dumps(self.__flatmap.sckan_neuron_populations.neurons_with_evidence(), indent=4))
-
-        if ((svg_export_file := settings.get('exportSVG')) is not None
-         and 'svg-maker' in self.__processing_store):
-            svg_maker = self.__processing_store['svg-maker']
-            svg_file = pathlib.Path(svg_export_file).with_suffix('.svg')
-            with open(svg_file, 'w') as fp:
-                svg_maker.save(fp)
-                log.info('Saved SVG', svg=svg_file)
-
-        # Create a Sparc dataset if publishing
-        if (sds_output := settings.get('publish')) is not None:
-            log.info('Generating SPARC dataset...', dataset=sds_output)
-            sparc_dataset = SparcDataset(self.__flatmap)
-            sparc_dataset.generate()
-            sparc_dataset.save(sds_output)
+        # Profile the stages of making the map
+        profile = BuildProfile()
+        settings['BUILD_PROFILE'] = profile
+        trace_memory = settings.get('profileMemory', False) and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
+        try:
+            with profile_span('make'):
+                self.__begin_make()
+
+                # Process flatmap's sources to create MapLayers
+                with profile_span('sources'):
+                    base_source = self.__process_sources()
+
+                # Finish flatmap processing (path routing, etc)
+                with profile_span('close'):
+                    self.__flatmap.close()
+
+                # Do we have any map layers?
+                if len(self.__flatmap) == 0:
+                    raise ValueError('No map layers in sources...')
+
+                # Save annotation
+                if self.__annotator is not None:
+                    with profile_span('annotation'):
+                        self.__annotator.save()
+
+                # Output all features (as GeoJSON) and optionally, their identifiers
+                with profile_span('geojson'):
+                    self.__output_features()
+
+                # Generate vector tiles from GeoJSON
+                with profile_span('vector-tiles'):
+                    self.__make_vector_tiles()
+
+                # Generate image tiles as required
+                with profile_span('raster-tiles'):
+                    self.__check_raster_tiles()
+
+                # Save an SVG preview in the output directory
+                if base_source is not None:
+                    with profile_span('preview'):
+                        self.__create_preview(base_source)
+
+                # Save the flatmap's metadata
+                with profile_span('metadata'):
+                    self.__save_metadata()
+
+                # We now have successfully generated the flatmap
+                generated_map = {'id': self.__id, 'uuid': self.uuid, 'path': self.__map_dir}
+                if self.__flatmap.models is not None:
+                    generated_map['models'] = self.__flatmap.models
+                log.info('Generated map', **generated_map)
+                log.critical('Mapmaker succeeded', **generated_map)
+
+                # Write out details of FC neurons if option set
+                if (export_file := settings.get('exportNeurons')) is not None:
+                    with open(export_file, 'w') as fp:
+                        fp.write(json.dumps(self.__flatmap.sckan_neuron_populations.neurons_with_evidence(), indent=4))
+
+                if ((svg_export_file := settings.get('exportSVG')) is not None
+                 and 'svg-maker' in self.__processing_store):
+                    svg_maker = self.__processing_store['svg-maker']
+                    svg_file = pathlib.Path(svg_export_file).with_suffix('.svg')
+                    with open(svg_file, 'w') as fp:
+                        svg_maker.save(fp)
+                        log.info('Saved SVG', svg=svg_file)
+
+                # Create a Sparc dataset if publishing
+                if (sds_output := settings.get('publish')) is not None:
+                    with profile_span('sparc-dataset'):
+                        log.info('Generating SPARC dataset...', dataset=sds_output)
+                        sparc_dataset = SparcDataset(self.__flatmap)
+                        sparc_dataset.generate()
+                        sparc_dataset.save(sds_output)
+        finally:
+            # A failed build's profile is saved too, as far as it got
+            if trace_memory:
+                tracemalloc.stop()
+            settings.pop('BUILD_PROFILE', None)
+            self.__save_profile(profile)
 
         # Tidy up
         self.__clean_up()
@@ -343,6 +377,14 @@ class MapMaker:
         self.__geojson_files = []
         self.__tippe_inputs = []
 
+    def __save_profile(self, profile: BuildProfile):
+    #===============================================
+        profile.save(os.path.join(self.__map_dir, BUILD_PROFILE))
+        summary = profile.summary()
+        log.info('Build profile', **{k.replace('-', '_'): v for k, v in summary.get('total', {}).items()})
+        for stage, stage_profile in summary.get('stages', {}).items():
+            log.info('Build stage', stage=stage, **{k.replace('-', '_'): v for k, v in stage_profile.items()})
+
     def __clean_up(self, remove_sentinel=True):
     #==========================================
         # We are finished with the knowledge base
@@ -386,28 +428,34 @@ class MapMaker:
             href = source_manifest.href
             if self.__flatmap.map_kind == MAP_KIND.FUNCTIONAL:
                 if href.endswith('.svg') or source_kind in SOURCE_DETAIL_KINDS:
+                    from .sources import SVGSource
                     try:
                         source = SVGSource(self.__flatmap, source_manifest)
                     except ValueError as err:
                         log.error(f'Source layer skipped', file=href, error=err)
                         continue
                 elif source_kind in ['base', 'layer']:
+                    from .sources import FCPowerpointSource
                     source = FCPowerpointSource(self.__flatmap, source_manifest,
                                                 shape_filter=self.__shape_filter,
                                                 process_store=self.__processing_store)
                 else:
                     raise ValueError(f'Unsupported FC kind: {source_kind}')
             elif source_kind == 'slides':
+                from .sources import PowerpointSource
                 source = PowerpointSource(self.__flatmap, source_manifest)
             elif source_kind == 'image':
                 if layer_number > 0 and source_manifest.boundary is None:
                     raise ValueError('An image source must specify a boundary')
+                from .sources import MBFSource
                 source = MBFSource(self.__flatmap, source_manifest, exported=(layer_number==0))
             elif source_kind in ['base', 'detail', 'details']:
+                from .sources import SVGSource
                 source = SVGSource(self.__flatmap, source_manifest)
             else:
                 raise ValueError(f'Unsupported source kind: {source_kind}')
-            source.process()
+            with profile_span(f'{source_kind}:{id}'):
+                source.process()
             for (msg_kind, msg) in source.errors:
                 if msg_kind == 'error':
                     log.error(msg)
@@ -442,6 +490,7 @@ class MapMaker:
         for tilemaker in tilemakers:
             if tilemaker.have_tiles():
                 self.__raster_layers.append(tilemaker.raster_layer)
+                profile_count('raster-tiles', tilemaker.tile_count())
 
     def __create_preview(self, source):
     #==================================
@@ -482,6 +531,7 @@ class MapMaker:
         tile_db.add_metadata(center=','.join([str(x) for x in self.__flatmap.centre]),      # type: ignore
                              bounds=','.join([str(x) for x in self.__flatmap.extent]))      # type: ignore
         tile_db.execute("COMMIT")
+        profile_count('vector-tiles', tile_db.tile_count())
         tile_db.close();
 
     def __output_features(self):
@@ -546,6 +596,9 @@ class MapMaker:
         tile_db.add_metadata(annotations=json.dumps(self.__flatmap.annotations, default=set_as_list))
         # Save node_hierarchy in metadata
         tile_db.add_metadata(node_hierarchy=json.dumps(self.__flatmap.properties_store.node_hierarchy))
+        # Save a summary of the stages of making the map so far
+        if (profile := settings.get('BUILD_PROFILE')) is not None:
+            tile_db.add_metadata(build_profile=json.dumps(profile.summary()))
 
         # Commit updates to the database
         tile_db.execute("COMMIT")
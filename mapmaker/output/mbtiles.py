@@ -67,6 +67,9 @@ class MBTiles(object):
         else:
             return dict(self._connnection.execute('select name, value from metadata;').fetchall())
 
+    def tile_count(self) -> int:
+        return self._cursor.execute('select count(*) from tiles;').fetchone()[0]
+
     def get_tile(self, zoom, x, y):
         rows = self._cursor.execute("""select tile_data from tiles
                                           where zoom_level=? and tile_column=? and tile_row=?;""",
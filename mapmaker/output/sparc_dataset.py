@@ -18,6 +18,8 @@
 #
 #===============================================================================
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
@@ -29,12 +31,14 @@ import mimetypes
 import os
 from pathlib import Path
 import shutil
-from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
-from typing import Optional
+import tempfile
+import time
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+from typing import IO, Optional
+import zlib
 
 #===============================================================================
 
-import openpyxl
 import requests
 
 #===============================================================================
@@ -47,7 +51,21 @@ MAPPING_DATA_JSON = str(importlib.resources.files('mapmaker.output').joinpath('d
 
 #===============================================================================
 
-from mapmaker.utils import pathlib_path
+# Files that are already compressed are stored in the archive as is
+STORED_FILE_SUFFIXES = ['.gz', '.jp2', '.jpeg', '.jpg', '.mbtiles', '.png', '.xlsx', '.zip']
+
+# Files are deflated in chunks of this size, in parallel
+DEFLATE_CHUNK_SIZE = 16*1024*1024
+
+# Deflated data of an archive entry is kept in memory until it reaches this size
+DEFLATED_SPOOL_SIZE = 64*1024*1024
+
+#===============================================================================
+
+from mapmaker.utils import CPU_COUNT, lazy_import, pathlib_path
+
+# Only needed when publishing
+openpyxl = lazy_import('openpyxl')
 
 #===============================================================================
 
@@ -157,6 +175,98 @@ class DatasetDescription:
 
 #===============================================================================
 
+def deflate_chunk(chunk: bytes, last: bool) -> bytes:
+#====================================================
+    """
+    Deflate a chunk of a file into a raw deflate stream.
+
+    All but the last chunk of a file end with a sync flush, rather than a
+    final block, so that the streams of successive chunks can be concatenated.
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+#===============================================================================
+
+class DatasetArchive(ZipFile):
+    """
+    A ZIP archive for a dataset, with files deflated in parallel.
+    """
+    def __init__(self, file: str):
+        super().__init__(file, mode='w', compression=ZIP_DEFLATED)
+        # ``zlib`` releases the GIL while compressing, so threads compress in parallel
+        self.__executor = ThreadPoolExecutor(CPU_COUNT)
+        self.__pending: deque[tuple[Optional[Future[bytes]], Optional[ZipInfo]]] = deque()
+        self.__deflated: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=DEFLATED_SPOOL_SIZE)
+
+    def close(self):
+    #===============
+        self.__executor.shutdown()
+        self.__deflated.close()
+        super().close()
+
+    def add_files(self, files: list[tuple[ZipInfo, Path]]):
+    #======================================================
+        """
+        Add files to the archive, in order.
+
+        Files that are already compressed are stored. Other files are read in
+        chunks which are deflated in parallel, with the resulting streams
+        written to the archive in the order of the chunks.
+        """
+        for (zinfo, path) in files:
+            if path.suffix.lower() in STORED_FILE_SUFFIXES:
+                self.__write_pending(0)
+                zinfo.compress_type = ZIP_STORED
+                with open(path, 'rb') as src, self.open(zinfo, 'w') as dest:
+                    shutil.copyfileobj(src, dest, 1024*1024)
+                continue
+            zinfo.CRC = 0
+            zinfo.file_size = 0
+            with open(path, 'rb') as src:
+                last = False
+                while not last:
+                    chunk = src.read(DEFLATE_CHUNK_SIZE)
+                    last = (len(chunk) < DEFLATE_CHUNK_SIZE)
+                    zinfo.CRC = zlib.crc32(chunk, zinfo.CRC)
+                    zinfo.file_size += len(chunk)
+                    self.__pending.append((self.__executor.submit(deflate_chunk, chunk, last), None))
+                    # Limit the number of chunks being held in memory
+                    self.__write_pending(2*CPU_COUNT)
+            self.__pending.append((None, zinfo))
+        self.__write_pending(0)
+
+    def __write_pending(self, max_pending: int):
+    #===========================================
+        while len(self.__pending) > max_pending:
+            (future, zinfo) = self.__pending.popleft()
+            if future is not None:
+                self.__deflated.write(future.result())
+            elif zinfo is not None:
+                self.__write_deflated(zinfo)
+
+    def __write_deflated(self, zinfo: ZipInfo):
+    #==========================================
+        # What ``ZipFile.writestr()`` does, except that data is already deflated
+        zinfo.compress_type = ZIP_DEFLATED
+        zinfo.compress_size = self.__deflated.tell()
+        self.__deflated.seek(0)
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)                # type: ignore
+            zinfo.header_offset = self.fp.tell()            # type: ignore
+            self._writecheck(zinfo)                         # type: ignore
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader())               # type: ignore
+            shutil.copyfileobj(self.__deflated, self.fp, 1024*1024)
+            self.start_dir = self.fp.tell()                 # type: ignore
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+        self.__deflated.seek(0)
+        self.__deflated.truncate()
+
+#===============================================================================
+
 @dataclass
 class DatasetFile:
     filename: str
@@ -210,33 +320,31 @@ class DirectoryManifest:
             record.append(value)
         self.__file_records.append(record)
 
-    def __get_bytes(self):
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
-        if worksheet is not None:
-            for col, value in enumerate(self.COLUMNS + tuple(self.__metadata.keys()), start=1):
-                worksheet.cell(row=1, column=col, value=value)
-            for row, record in enumerate(self.__file_records, start=2):
-                for col, value in enumerate(record, start=1):
-                    worksheet.cell(row=row, column=col, value=value)
-        buffer = BytesIO()
-        workbook.save(buffer)
-        buffer.seek(0)
+    def __save_manifest(self, archive: ZipFile, arcname: str):
+        # Stream the manifest's rows into the archive, storing the workbook
+        # as it is itself a ZIP file
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(self.COLUMNS + tuple(self.__metadata.keys()))
+        for record in self.__file_records:
+            worksheet.append(record)
+        zinfo = ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+        zinfo.compress_type = ZIP_STORED
+        zinfo.external_attr = 0o600 << 16
+        with archive.open(zinfo, 'w') as dest:
+            workbook.save(dest)
         workbook.close()
-        return buffer
 
-    def copy_to_archive(self, archive: ZipFile, target: str):
+    def copy_to_archive(self, archive: DatasetArchive, target: str):
+        files = []
         for file in self.files:
             zinfo = ZipInfo.from_file(file.fullpath, arcname=f'{target}/{file.filename}')
-            zinfo.compress_type = ZIP_DEFLATED
             timestamp = file.timestamp
             zinfo.date_time = (timestamp.year, timestamp.month, timestamp.day,
                                timestamp.hour, timestamp.minute, timestamp.second)
-            with open(file.fullpath, "rb") as src, archive.open(zinfo, 'w') as dest:
-                shutil.copyfileobj(src, dest, 1024*8)
-        manifest_workbook = self.__get_bytes()
-        archive.writestr(f'{target}/manifest.xlsx', manifest_workbook.getvalue())
-        manifest_workbook.close()
+            files.append((zinfo, file.fullpath))
+        archive.add_files(files)
+        self.__save_manifest(archive, f'{target}/manifest.xlsx')
 
 #===============================================================================
 
@@ -275,7 +383,7 @@ class FlatmapDirectoryManifests:
     def dataset_image(self):
         return self.__dataset_image
 
-    def copy_to_archive(self, archive: ZipFile):
+    def copy_to_archive(self, archive: DatasetArchive):
         self.__primary_manifest.copy_to_archive(archive, 'files/primary')
         self.__derivative_manifest.copy_to_archive(archive, 'files/derivative')
 
@@ -298,7 +406,7 @@ class SparcDataset:
 
     def save(self, dataset: str):
         # create archive
-        dataset_archive = ZipFile(dataset, mode='w', compression=ZIP_DEFLATED)
+        dataset_archive = DatasetArchive(dataset)
 
         # adding dataset_description
         desc_bytes = self.__description.get_bytes()
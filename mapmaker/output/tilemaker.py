@@ -526,6 +526,12 @@ class RasterTileMaker(object):
     #====================
         return os.path.exists(self.__database_path)
 
+    def tile_count(self) -> int:
+    #===========================
+        if not self.have_tiles():
+            return 0
+        return MBTiles(self.__database_path).tile_count()
+
     def make_tiles(self):
     #====================
         log.info('Tiling {}...'.format(self.__id))
@@ -19,7 +19,7 @@
 #===============================================================================
 
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 #===============================================================================
 
@@ -46,6 +46,11 @@ class PropertiesStore(object):
         self.__properties_by_id = defaultdict(dict)
         self.__nerve_ids_by_model = {}
         self.__nerve_models_by_id = {}
+        # Merged class and id properties, keyed by ``(classes, id)``. Cached
+        # dictionaries are shared between features and must not be modified
+        self.__resolved_properties: dict[tuple[tuple[str, ...], Optional[str]], tuple[list[str], dict[str, Any]]] = {}
+        self.__resolved_classes_by_id: defaultdict[Optional[str], set[tuple[str, ...]]] = defaultdict(set)
+        self.__entity_knowledge: dict[str, tuple[Optional[str], Optional[list]]] = {}
         if manifest.properties is None:
             properties_dict = {}
         else:
@@ -227,6 +232,9 @@ class PropertiesStore(object):
     def set_property(self, id, key, value):
     #======================================
         self.__properties_by_id[id][key] = value
+        # Invalidate any merged properties that depend on the feature's id
+        for classes in self.__resolved_classes_by_id.pop(id, set()):
+            self.__resolved_properties.pop((classes, id), None)
 
     def properties(self, id):
     #========================
@@ -235,22 +243,54 @@ class PropertiesStore(object):
         self.update_properties(properties)
         return properties
 
+    def __resolve_properties(self, classes: tuple[str, ...], id: Optional[str]) -> tuple[list[str], dict[str, Any]]:
+    #==============================================================================================================
+        """
+        Merge the static class and id properties of a feature.
+
+        The result depends only on the feature's classes and id, so is computed
+        once per ``(classes, id)`` pair and then shared by all features with the
+        same key.
+        """
+        key = (classes, id)
+        if (resolved := self.__resolved_properties.get(key)) is not None:
+            return resolved
+        all_classes = list(classes)
+        if id is not None:
+            all_classes.extend(self.__properties_by_id.get(id, {}).get('class', '').split())
+        properties = {}
+        for cls in all_classes:
+            properties.update(self.__anatomical_map.properties(cls))
+            properties.update(self.__properties_by_class.get(cls, {}))
+        if id is not None:         # id overrides class
+            properties.update(self.__anatomical_map.properties(id))
+            properties.update(self.__properties_by_id.get(id, {}))
+        resolved = (all_classes, properties)
+        self.__resolved_properties[key] = resolved
+        self.__resolved_classes_by_id[id].add(classes)
+        return resolved
+
+    def __knowledge_label_and_taxons(self, entity: str) -> tuple[Optional[str], Optional[list]]:
+    #===========================================================================================
+        if (knowledge := self.__entity_knowledge.get(entity)) is None:
+            # Make sure our knowledgebase knows about the anatomical object
+            entity_knowledge = knowledgebase.get_knowledge(entity)
+            taxons = entity_knowledge.get('taxons')
+            knowledge = (entity_knowledge.get('label'),
+                         None if taxons is None else taxons if isinstance(taxons, list) else [taxons])
+            self.__entity_knowledge[entity] = knowledge
+        return knowledge
+
     def update_properties(self, feature_properties):
     #===============================================
-        classes = feature_properties.get('class', '').split()
         id = feature_properties.get('id')
         if self.__flatmap.map_kind == MAP_KIND.FUNCTIONAL and id not in self.__properties_by_id:
             # Use the feature's name to lookup properties when the feature has no ID
             if (name := feature_properties.get('name', '').replace(' ', '_')) != '':
                 id = f'{feature_properties.get('layer', '')}/{name}'
-        if id is not None:
-            classes.extend(self.__properties_by_id.get(id, {}).get('class', '').split())
-        for cls in classes:
-            feature_properties.update(self.__anatomical_map.properties(cls))
-            feature_properties.update(self.__properties_by_class.get(cls, {}))
-        if id is not None:         # id overrides class
-            feature_properties.update(self.__anatomical_map.properties(id))
-            feature_properties.update(self.__properties_by_id.get(id, {}))
+        (classes, static_properties) = self.__resolve_properties(
+                                            tuple(feature_properties.get('class', '').split()), id)
+        feature_properties.update(static_properties)
         self.__pathways.update_line_or_nerve_properties(feature_properties)
 
         if 'marker' in feature_properties:
@@ -265,9 +305,7 @@ class PropertiesStore(object):
         # Only separately show name when authoring FC map
         name_used = self.__flatmap.map_kind != MAP_KIND.FUNCTIONAL
         if (entity := feature_properties.get('models')) is not None and entity.strip() != '':
-            # Make sure our knowledgebase knows about the anatomical object
-            knowledge = knowledgebase.get_knowledge(entity)
-            label = knowledge.get('label')
+            (label, taxons) = self.__knowledge_label_and_taxons(entity)
             if label == entity and (source_label := feature_properties.get('label', '')):
                 feature_properties['label'] = source_label
             elif settings.get('authoring', False):
@@ -280,8 +318,8 @@ class PropertiesStore(object):
                 if 'name' in feature_properties:
                      label += '\n' + feature_properties.get('name', '')
                 feature_properties['label'] = label
-            if (taxons := knowledge.get('taxons')) is not None:
-                feature_properties['taxons'] = taxons if isinstance(taxons, list) else [taxons]
+            if taxons is not None:
+                feature_properties['taxons'] = list(taxons)
         elif 'label' not in feature_properties and 'name' in feature_properties:
             feature_properties['label'] = feature_properties['name']
             name_used = True
@@ -18,11 +18,10 @@
 #
 #===============================================================================
 
-import openpyxl
+from mapmaker.utils import FilePath, lazy_import, log
 
-#===============================================================================
-
-from mapmaker.utils import FilePath, log
+# Only needed when the anatomical map is a spreadsheet
+openpyxl = lazy_import('openpyxl')
 
 #===============================================================================
 
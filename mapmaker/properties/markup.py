@@ -18,10 +18,16 @@
 #
 #===============================================================================
 
-from pyparsing import alphanums, nums, printables
+from functools import lru_cache
+import re
+from typing import Optional
+
+#===============================================================================
+
+from pyparsing import alphanums, nums
 from pyparsing import Combine, delimitedList, Group, Keyword
-from pyparsing import Optional, Suppress, Word, ZeroOrMore
-from pyparsing import ParseException, ParseResults
+from pyparsing import Suppress, Word, ZeroOrMore
+from pyparsing import ParseException
 
 #===============================================================================
 
@@ -29,7 +35,6 @@ from mapmaker.settings import settings
 
 #===============================================================================
 
-FREE_TEXT = Word(printables + ' ', excludeChars='()')
 INTEGER = Word(nums)
 
 ID_TEXT = Word(alphanums, alphanums+':/_-.')
@@ -64,39 +69,49 @@ LAYER_DIRECTIVE = '.' + ZeroOrMore(LAYER_DIRECTIVES)
 ## Details are positioned within polygon's boundary on a layer "above" the polygon's
 ## fill layer. Say positioned on an invisible place holder that is grouped with the polygon??
 
-CLASS = Group(Keyword('class') + Suppress('(') + ID_TEXT + Suppress(')'))
-CHILDCLASSES = Group(Keyword('children') + Suppress('(') + ID_TEXT + Suppress(')'))
-DETAILS = Group(Keyword('details') + Suppress('(') + ID_TEXT + Suppress(',') + ZOOM_LEVEL + Suppress(')'))
-PATH = Group(Keyword('path') + Suppress('(') + ID_TEXT + Suppress(')'))
-STYLE = Group(Keyword('style') + Suppress('(') + INTEGER + Suppress(')'))
-
-NAME = Group(Keyword('name') + Suppress('(') + FREE_TEXT + Suppress(')'))
-
-FEATURE_PROPERTIES = CLASS | CHILDCLASSES | IDENTIFIER | NAME | STYLE
-
-SHAPE_FLAGS = Group(Keyword('background')
-                  | Keyword('boundary')
-                  | Keyword('closed')
-                  | Keyword('exterior')
-                  | Keyword('interior')
-                  )
-
-FEATURE_FLAGS = Group(Keyword('centreline')
-                    | Keyword('divider')
-                    | Keyword('group')
-                    | Keyword('invisible')
-                    | Keyword('marker')
-                    | Keyword('node')
-                    | Keyword('region')
-                    | Keyword('siblings')
-                    | Keyword('styling')       # Element (and sub-elements) are just for stylistic effects
-                  )
-
-SHAPE_MARKUP = '.' + ZeroOrMore(DETAILS
-                              | FEATURE_FLAGS
-                              | FEATURE_PROPERTIES
-                              | PATH
-                              | SHAPE_FLAGS)
+# Shape markup is scanned directly rather than with a ``pyparsing`` grammar as it
+# is parsed for every SVG element and Powerpoint shape. The scanner accepts exactly
+# the same language as ``pyparsing`` did, including its whitespace and keyword
+# boundary rules.
+
+MARKUP_WHITESPACE = re.compile(r'[ \t\n\r]*')
+MARKUP_KEYWORD = re.compile(r'[A-Za-z0-9_$]+')
+
+MARKUP_FREE_TEXT = re.compile(r"[!-'*-~ ]+")        # printables and space, excluding '(' and ')'
+MARKUP_ID_TEXT = re.compile(r'[A-Za-z0-9][A-Za-z0-9:/_\-.]*')
+MARKUP_INTEGER = re.compile(r'[0-9]+')
+
+MARKUP_ARGUMENTS = {
+    'children': (MARKUP_ID_TEXT,),
+    'class': (MARKUP_ID_TEXT,),
+    'details': (MARKUP_ID_TEXT, MARKUP_INTEGER),
+    'id': (MARKUP_ID_TEXT,),
+    'name': (MARKUP_FREE_TEXT,),
+    'path': (MARKUP_ID_TEXT,),
+    'style': (MARKUP_INTEGER,),
+}
+
+SHAPE_FLAGS = {
+    'background',
+    'boundary',
+    'closed',
+    'exterior',
+    'interior',
+}
+
+FEATURE_FLAGS = {
+    'centreline',
+    'divider',
+    'group',
+    'invisible',
+    'marker',
+    'node',
+    'region',
+    'siblings',
+    'styling',          # Element (and sub-elements) are just for stylistic effects
+}
+
+MARKUP_FLAGS = FEATURE_FLAGS | SHAPE_FLAGS
 
 #===============================================================================
 
@@ -123,32 +138,81 @@ def parse_layer_directive(s):
 
 #===============================================================================
 
-def parse_markup(markup):
+class MarkupSyntaxError(Exception):
+    def __init__(self, pos: int):
+        self.pos = pos
+
+def __scan_markup(markup: str) -> list[tuple[str, tuple[str, ...]]]:
+#===================================================================
+    # Each markup element is returned as a keyword with its argument list
+    elements = []
+    pos = MARKUP_WHITESPACE.match(markup).end()
+    if not markup.startswith('.', pos):
+        raise MarkupSyntaxError(pos)
+    pos = MARKUP_WHITESPACE.match(markup, pos + 1).end()
+    while pos < len(markup):
+        if (match := MARKUP_KEYWORD.match(markup, pos)) is None:
+            raise MarkupSyntaxError(pos)
+        keyword = match[0]
+        pos = MARKUP_WHITESPACE.match(markup, match.end()).end()
+        if keyword in MARKUP_FLAGS:
+            elements.append((keyword, ()))
+            continue
+        if (argument_patterns := MARKUP_ARGUMENTS.get(keyword)) is None:
+            raise MarkupSyntaxError(match.start())
+        arguments = []
+        separator = '('
+        for pattern in argument_patterns:
+            if not markup.startswith(separator, pos):
+                raise MarkupSyntaxError(pos)
+            pos = MARKUP_WHITESPACE.match(markup, pos + 1).end()
+            if (match := pattern.match(markup, pos)) is None:
+                raise MarkupSyntaxError(pos)
+            arguments.append(match[0])
+            pos = MARKUP_WHITESPACE.match(markup, match.end()).end()
+            separator = ','
+        if not markup.startswith(')', pos):
+            raise MarkupSyntaxError(pos)
+        pos = MARKUP_WHITESPACE.match(markup, pos + 1).end()
+        elements.append((keyword, tuple(arguments)))
+    return elements
+
+@lru_cache(maxsize=8192)
+def __parse_markup(markup: str) -> tuple[dict, Optional[int]]:
+#=============================================================
+    # Identical markup recurs frequently so results are cached. The cached
+    # dictionary is never returned directly as callers modify their properties
     properties = {'markup': markup}
     deprecated = []
     try:
-        parsed = SHAPE_MARKUP.parseString(markup, parseAll=True)
-        for prop in parsed[1:]:
-            if prop[0] in DEPRECATED_MARKUP:
-                deprecated.append(prop[0])
-            if (FEATURE_FLAGS.matches(prop[0])
-             or SHAPE_FLAGS.matches(prop[0])):
-                properties[prop[0]] = True
-            elif prop[0] == 'details':
-                properties[prop[0]] = prop[1]
-                properties['maxzoom'] = int(prop[2]) - 1
+        for (keyword, arguments) in __scan_markup(markup):
+            if keyword in DEPRECATED_MARKUP:
+                deprecated.append(keyword)
+            if keyword in MARKUP_FLAGS:
+                properties[keyword] = True
+            elif keyword == 'details':
+                properties[keyword] = arguments[0]
+                properties['maxzoom'] = int(arguments[1]) - 1
             else:
-                properties[prop[0]] = prop[1]
-    except ParseException:
-        properties['error'] = 'Syntax error'
-        if settings.get('debug', False):
-            raise
+                properties[keyword] = arguments[0]
+    except MarkupSyntaxError as error:
+        properties = {
+            'markup': markup,
+            'error': 'Syntax error'
+        }
+        return (properties, error.pos)
     if len(deprecated):
         properties['warning'] = f"Deprecated `{', '.join(deprecated)}`"
     if ('styling' in properties
     and ('id' in properties or 'class' in properties)):
         properties['error'] = "'styling' element can't have an 'id' nor 'class'"
-    return properties
+    return (properties, None)
+
+def parse_markup(markup):
+    (properties, error_pos) = __parse_markup(markup)
+    if error_pos is not None and settings.get('debug', False):
+        raise ParseException(markup, error_pos, 'Syntax error in markup')
+    return properties.copy()
 
 #===============================================================================
 
@@ -156,8 +220,7 @@ def properties_to_markup(properties):
     markup_elements = []
     details = {}
     for key, value in properties.items():
-        if (FEATURE_FLAGS.matches(key)
-         or SHAPE_FLAGS.matches(key)):
+        if key in MARKUP_FLAGS:
             if value:
                 markup_elements.append(key)
         elif key in ['details', 'maxzoom']:
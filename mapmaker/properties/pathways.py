@@ -789,8 +789,7 @@ class Pathways:
         log.info(f'Routing {network.id} paths...')
 
         active_nerve_features: set[Feature] = set()
-        paths_by_id = {}
-        route_graphs: dict[str, nx.Graph] = {}
+        paths_by_id: dict[str, Path] = {}
         network.create_geometry()
 
         # Find route graphs for each path in each connectivity model
@@ -798,7 +797,7 @@ class Pathways:
             if connectivity_model.network == network.id:
                 for path in connectivity_model.paths.values():
                     paths_by_id[path.id] = path
-                    route_graphs[path.id] = network.route_graph_from_path(path)
+        route_graphs = network.route_graphs_from_paths(list(paths_by_id.values()))
 
         # Now order them across shared centrelines
         routed_paths = network.layout(route_graphs)
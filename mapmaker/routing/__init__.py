@@ -30,9 +30,14 @@ from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass, field
 from functools import partial
+import io
 import itertools
 import math
+import pickle
+import queue
 import sys
+import time
+import traceback
 import typing
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -56,7 +61,10 @@ else:
 from beziers.path import BezierPath
 from beziers.point import Point as BezierPoint
 
+import multiprocess as mp
 import networkx as nx
+import numpy as np
+import shapely
 import shapely.geometry
 import structlog
 
@@ -71,7 +79,7 @@ from mapmaker.knowledgebase import AnatomicalNode
 from mapmaker.knowledgebase.celldl import FC_CLASS, FC_KIND
 from mapmaker.knowledgebase.sckan import PATH_TYPE
 from mapmaker.settings import settings
-from mapmaker.utils import log
+from mapmaker.utils import CPU_COUNT, log
 import mapmaker.utils.graph as graph_utils
 
 #===============================================================================
@@ -86,6 +94,48 @@ if TYPE_CHECKING:
     from mapmaker.properties import PropertiesStore
     from mapmaker.properties.pathways import Path
 
+#===============================================================================
+
+# Fewer paths than this are routed in the main process
+MIN_PARALLEL_ROUTING_PATHS = 16
+
+#===============================================================================
+
+class RouteGraphPickler(pickle.Pickler):
+    """
+    Pickle route graphs found in a forked routing process, with the map's
+    features and objects from the network's centreline graph pickled by
+    reference so that the unpickled route graph refers to the parent's objects.
+    """
+    def __init__(self, file, flatmap: 'FlatMap', shared_objects: dict[int, Any]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__flatmap = flatmap
+        self.__shared_objects = shared_objects
+
+    def persistent_id(self, obj):
+    #============================
+        if isinstance(obj, Feature):
+            if self.__flatmap.get_feature_by_geojson_id(obj.geojson_id) is obj:
+                return ('feature', obj.geojson_id)
+        elif self.__shared_objects.get(id(obj)) is obj:
+            return ('shared', id(obj))
+        return None
+
+class RouteGraphUnpickler(pickle.Unpickler):
+    def __init__(self, file, flatmap: 'FlatMap', shared_objects: dict[int, Any]):
+        super().__init__(file)
+        self.__flatmap = flatmap
+        self.__shared_objects = shared_objects
+
+    def persistent_load(self, pid):
+    #==============================
+        (kind, key) = pid
+        if kind == 'feature':
+            return self.__flatmap.get_feature_by_geojson_id(key)
+        elif kind == 'shared':
+            return self.__shared_objects[key]
+        raise pickle.UnpicklingError(f'Unknown persistent id: {pid}')
+
 
 #=============================================================
 
@@ -191,6 +241,7 @@ class Network(object):
         self.__feature_ids: set[str] = set()
         self.__full_ids: set[str] = set()                                          #! A ``full id`` is a slash-separated list of feature ids
         self.__missing_identifiers: set[AnatomicalNode] = set()
+        self.__missing_features: Optional[set[str]] = None                         #! Missing features found by a routing process
         self.__end_feature_ids = set()
         self.__container_feature_ids = set()
 
@@ -201,6 +252,7 @@ class Network(object):
         self.__expanded_centreline_graph: Optional[nx.Graph] = None                 #! Expanded version of centreline graph
         self.__segment_edge_by_segment: dict[str, tuple[str, str, str]] = {}        #! Segment id --> segment edge
         self.__segment_ids_by_centreline: dict[str, list[str]] = defaultdict(list)  #! Centreline id --> segment ids of the centreline
+        self.__centreline_node_centres: dict[str, shapely.geometry.Point] = {}      #! Node id --> centroid of the node's geometry
 
         # Track how nodes are associated with centrelines
         end_nodes_to_centrelines = defaultdict(list)
@@ -346,9 +398,19 @@ class Network(object):
         if feature_id not in self.__missing_identifiers:
             if (feature := self.__flatmap.get_feature(feature_id)) is not None:
                 return feature
+            if self.__missing_features is None:
+                self.__missing_feature(feature_id)
+            else:
+                # A routing process leaves the main process to report a missing feature
+                self.__missing_features.add(feature_id)
+                self.__missing_identifiers.add(feature_id)
+        return None
+
+    def __missing_feature(self, feature_id):
+    #=======================================
+        if feature_id not in self.__missing_identifiers:
             self.__log.error('Cannot find network feature', feature=feature_id)
             self.__missing_identifiers.add(feature_id)
-        return None
 
     def create_geometry(self):
     #=========================
@@ -698,9 +760,167 @@ class Network(object):
 
         self.__expanded_centreline_graph = expand_centreline_graph(self.__centreline_graph)
 
+        # Find node centroids once, in bulk, for closest node searches
+        node_geometries = {node_id: geometry for node_id, geometry in self.__centreline_graph.nodes(data='geometry')
+                                                if geometry is not None}
+        self.__centreline_node_centres = dict(zip(node_geometries.keys(),
+                                                  shapely.centroid(np.array(list(node_geometries.values()), dtype=object))))
+
     def route_graph_from_path(self, path: 'Path') -> Optional[nx.Graph]:
     #===================================================================
-        return self.__route_graph_from_connectivity(path)
+        route_graph = self.__route_graph_from_connectivity(path)
+        if route_graph is not None:
+            self.__set_route_feature_properties(route_graph)
+        return route_graph
+
+    def route_graphs_from_paths(self, paths: list['Path']) -> dict[str, Optional[nx.Graph]]:
+    #======================================================================================
+        """
+        Find the route graphs of ``paths``, using a pool of forked processes
+        when there are enough paths to make this worthwhile.
+
+        Connectivity nodes are always mapped to map features in this process, so
+        route graphs are returned, and map features updated, in the order of
+        ``paths`` and the same way regardless of how many processes are used.
+        """
+        processes = min(settings.get('routeProcesses', CPU_COUNT), len(paths))
+        start_time = time.perf_counter()
+        prepared = [self.__timed_call(self.__prepare_connectivity, path) for path in paths]
+        if (processes > 1 and len(paths) >= MIN_PARALLEL_ROUTING_PATHS
+        and 'fork' in mp.get_all_start_methods()):
+            routed = self.__route_paths_in_parallel(paths, prepared, processes)
+        else:
+            processes = 1
+            routed = [self.__timed_route_graph(path, connectivity) for path, connectivity in zip(paths, prepared)]
+        route_graphs = {}
+        failed_paths = []
+        elapsed_times = []
+        for path, (_, prepare_time, _), (route_graph, route_time, error) in zip(paths, prepared, routed):
+            elapsed = prepare_time + route_time
+            elapsed_times.append(elapsed)
+            if error is not None:
+                self.__log.error('Cannot route path', path=path.id, time=f'{elapsed:.3f}s', error=error)
+                failed_paths.append(path.id)
+                continue
+            self.__log.debug('Routed path', path=path.id, time=f'{elapsed:.3f}s')
+            if route_graph is not None:
+                self.__set_route_feature_properties(route_graph)
+            route_graphs[path.id] = route_graph
+        if len(paths):
+            (slowest, elapsed) = max(zip(paths, elapsed_times), key=lambda path_time: path_time[1])
+            self.__log.info(f'Routed {len(paths)} paths in {time.perf_counter() - start_time:.1f}s',
+                processes=processes, slowest=slowest.id, time=f'{elapsed:.3f}s')
+        if len(failed_paths):
+            raise ValueError(f'Cannot route paths: {", ".join(failed_paths)}')
+        return route_graphs
+
+    @staticmethod
+    def __timed_call(function, *args) -> tuple[Any, float, Optional[str]]:
+    #=====================================================================
+        start_time = time.perf_counter()
+        try:
+            result = function(*args)
+            error = None
+        except Exception:
+            result = None
+            error = traceback.format_exc()
+        return (result, time.perf_counter() - start_time, error)
+
+    def __timed_route_graph(self, path: 'Path', prepared: tuple[Optional[nx.Graph], float, Optional[str]]) -> tuple[Optional[nx.Graph], float, Optional[str]]:
+    #======================================================================================================================================================
+        (connectivity_graph, _, error) = prepared
+        if error is not None or connectivity_graph is None:
+            return (None, 0.0, error)
+        return self.__timed_call(self.__route_graph_from_prepared_connectivity, path, connectivity_graph)
+
+    def __shared_routing_objects(self) -> dict[int, Any]:
+    #====================================================
+        # Objects referenced by the centreline graph, which are shared with forked
+        # routing processes and so can be pickled by reference
+        shared_objects = {}
+        data_dicts = itertools.chain((node_dict for _, node_dict in self.__centreline_graph.nodes(data=True)),
+                                     (edge_dict for _, _, edge_dict in self.__centreline_graph.edges(data=True)))
+        for data_dict in data_dicts:
+            for value in data_dict.values():
+                if not isinstance(value, (str, int, float, bool)) and value is not None:
+                    shared_objects[id(value)] = value
+        return shared_objects
+
+    def __route_paths_in_parallel(self, paths: list['Path'], prepared: list[tuple[Optional[nx.Graph], float, Optional[str]]],
+                                  processes: int) -> list[tuple[Optional[nx.Graph], float, Optional[str]]]:
+    #======================================================================================================================
+        # Worker processes are forked so they share the network, map and prepared
+        # connectivity with this process without them being copied. Workers only
+        # route, so don't use the knowledge store inherited from this process
+        context = mp.get_context('fork')
+        shared_objects = self.__shared_routing_objects()
+        result_queue = context.Queue()
+        workers = []
+        for worker_number in range(processes):
+            # Interleave paths so that each worker gets a similar mix of them
+            path_indices = list(range(worker_number, len(paths), processes))
+            worker = context.Process(target=self.__route_paths_process,
+                                     args=(paths, prepared, path_indices, shared_objects, result_queue),
+                                     name=f'Routing-{worker_number}')
+            worker.start()
+            workers.append(worker)
+
+        results: list[Optional[tuple[Optional[nx.Graph], float, Optional[str]]]] = [None] * len(paths)
+        remaining = len(paths)
+        while remaining > 0:
+            try:
+                (index, pickled_graph, elapsed, error, missing_features) = result_queue.get(timeout=1)
+            except queue.Empty:
+                if any(worker.is_alive() for worker in workers) or not result_queue.empty():
+                    continue
+                break
+            route_graph = None
+            if pickled_graph is not None:
+                try:
+                    # The route graph has the path's connectivity graph, as updated when routing
+                    route_graph = RouteGraphUnpickler(io.BytesIO(pickled_graph), self.__flatmap, shared_objects).load()
+                except Exception:
+                    error = traceback.format_exc()
+            results[index] = (route_graph, elapsed, error)
+            # Missing features are reported here, so only once
+            for feature_id in missing_features:
+                self.__missing_feature(feature_id)
+            remaining -= 1
+        for worker in workers:
+            worker.join()
+        return [result if result is not None else (None, 0.0, 'Routing process terminated unexpectedly')
+                    for result in results]
+
+    def __route_paths_process(self, paths: list['Path'], prepared: list[tuple[Optional[nx.Graph], float, Optional[str]]],
+                              path_indices: list[int], shared_objects: dict[int, Any], result_queue):
+    #=====================================================================================================================
+        self.__missing_features = set()
+        for index in path_indices:
+            (route_graph, elapsed, error) = self.__timed_route_graph(paths[index], prepared[index])
+            pickled_graph = None
+            if error is None:
+                try:
+                    buffer = io.BytesIO()
+                    RouteGraphPickler(buffer, self.__flatmap, shared_objects).dump(route_graph)
+                    pickled_graph = buffer.getvalue()
+                except Exception:
+                    error = traceback.format_exc()
+            result_queue.put((index, pickled_graph, elapsed, error, self.__missing_features))
+            self.__missing_features = set()
+
+    def __set_route_feature_properties(self, route_graph: nx.Graph):
+    #===============================================================
+        # Identify features on the path with a nerve cuff used by the path
+        # and make hidden nodes that are actually used in the route visible
+        nerve_id = route_graph.graph.get('nerve-id')
+        for feature_id in route_graph.graph['node-features']:
+            feature = self.__map_feature(feature_id)
+            if feature is not None:  # Redundant test...
+                if nerve_id is not None:
+                    feature.set_property('nerveId', nerve_id)   # Used in map viewer
+                if 'auto-hide' in feature.get_property('class', ''):
+                    # Show the hidden feature on the map
+                    feature.pop_property('exclude')
 
     def layout(self, route_graphs: dict[str, nx.Graph]) -> dict[int, RoutedPath]:
     #============================================================================
@@ -764,34 +984,47 @@ class Network(object):
                 self.__missing_identifiers.add(connectivity_node)
         return properties
 
+    def __node_centres(self, node_ids: list[str]) -> np.ndarray:
+    #===========================================================
+        centres = []
+        for node_id in node_ids:
+            if (centre := self.__centreline_node_centres.get(node_id)) is None:
+                centre = self.__centreline_graph.nodes[node_id]['geometry'].centroid
+                self.__centreline_node_centres[node_id] = centre
+            centres.append(centre)
+        return np.array(centres, dtype=object)
+
     def __closest_feature_id_to_point(self, point, node_feature_ids) -> Optional[str]:
     #=================================================================================
-        # Find feature id of feature that is closest to ``point``.
-        closest_feature_id: Optional[str] = None
-        closest_distance = -1
-        for node_id in node_feature_ids:
-            node_centre = self.__centreline_graph.nodes[node_id]['geometry'].centroid
-            distance = point.distance(node_centre)
-            if closest_feature_id is None or distance < closest_distance:
-                closest_distance = distance
-                closest_feature_id = node_id
-        return closest_feature_id
+        # Find feature id of feature that is closest to ``point``, taking the
+        # first of ``node_feature_ids`` when several features are equally close.
+        node_ids = list(node_feature_ids)
+        if len(node_ids) == 0:
+            return None
+        distances = shapely.distance(point, self.__node_centres(node_ids))
+        return node_ids[int(np.argmin(distances))]
 
     def __closest_segment_node_to_point(self, point, segment_id) -> tuple[Optional[str], float]:
     #===========================================================================================
         # Find segment's node that is closest to ``point``.
-        closest_node = None
-        closest_distance = -1
-        for node_id in self.__segment_edge_by_segment[segment_id][0:2]:
-            node_centre = self.__centreline_graph.nodes[node_id]['geometry'].centroid
-            distance = point.distance(node_centre)
-            if closest_node is None or distance < closest_distance:
-                closest_distance = distance
-                closest_node = node_id
-        return (closest_node, closest_distance)
+        node_ids = list(self.__segment_edge_by_segment[segment_id][0:2])
+        distances = shapely.distance(point, self.__node_centres(node_ids))
+        index = int(np.argmin(distances))
+        return (node_ids[index], float(distances[index]))
 
     def __route_graph_from_connectivity(self, path: 'Path', debug=False) -> Optional[nx.Graph]:
     #==========================================================================================
+        return self.__route_graph_from_prepared_connectivity(path, self.__prepare_connectivity(path), debug)
+
+    def __prepare_connectivity(self, path: 'Path') -> nx.Graph:
+    #==========================================================
+        """
+        Map a path's connectivity nodes to map features and centrelines, bypassing
+        missing and merging aliased nodes.
+
+        This looks up knowledge, records anatomical nodes on map features, and notes
+        missing identifiers, so is always done in the main process.
+        """
         connectivity_graph = path.connectivity
 
         # Map connectivity nodes to map features and centrelines, storing the result
@@ -893,7 +1126,10 @@ class Network(object):
                 while (container := connectivity_graph.nodes[node].get('contained-by')) is not None:
                     connectivity_graph.nodes[container]['exclude'] = True
                     node = container
+        return connectivity_graph
 
+    def __route_graph_from_prepared_connectivity(self, path: 'Path', connectivity_graph: nx.Graph, debug=False) -> Optional[nx.Graph]:
+    #================================================================================================================================
         # Create the route graph for the connectivity path
         route_graph = nx.MultiGraph()
 
@@ -1405,19 +1641,11 @@ class Network(object):
         # Make sure the set of path nodes includes those from the routed path
         path_node_ids.update(route_graph.nodes)
 
-        # Identify features on the path with a nerve cuff used by the path
-        # and make hidden nodes that are actually used in the route visible
+        # The nerve cuff used by the path, set on the path's node features
+        # by ``__set_route_feature_properties()``
         nerve_id = list(path_nerve_ids)[0] if len(path_nerve_ids) else None
         if nerve_id is not None and (nerve_feature := self.__map_feature(nerve_id)) is not None:
             nerve_id = nerve_feature.geojson_id
-        for feature_id in path_node_ids:
-            feature = self.__map_feature(feature_id)
-            if feature is not None:  # Redundant test...
-                if nerve_id is not None:
-                    feature.set_property('nerveId', nerve_id)   # Used in map viewer
-                if 'auto-hide' in feature.get_property('class', ''):
-                    # Show the hidden feature on the map
-                    feature.pop_property('exclude')
 
         route_graph.graph['path-id'] = path.id
         route_graph.graph['label'] = path.label
@@ -1426,6 +1654,7 @@ class Network(object):
         route_graph.graph['traced'] = path.trace
         route_graph.graph['nerve-features'] = set(feature_id for feature_id in path_nerve_ids if self.__map_feature(feature_id) is not None)
         route_graph.graph['node-features'] = set(feature_id for feature_id in path_node_ids if self.__map_feature(feature_id) is not None)
+        route_graph.graph['nerve-id'] = nerve_id
         if 'alert' in connectivity_graph.graph:
             route_graph.graph['alert'] = connectivity_graph.graph['alert']
         if 'biological-sex' in connectivity_graph.graph:
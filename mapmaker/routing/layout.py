@@ -23,7 +23,13 @@ import itertools
 #===============================================================================
 
 import networkx as nx
-import pyomo.environ as pyomo
+
+#===============================================================================
+
+from mapmaker.utils import lazy_import
+
+# Only needed when paths are laid out
+pyomo = lazy_import('pyomo.environ')
 
 #===============================================================================
 
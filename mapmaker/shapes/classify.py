@@ -25,7 +25,9 @@ from typing import DefaultDict, Iterable, Optional
 #===============================================================================
 
 import networkx as nx
+import numpy as np
 from numpy import ndarray
+import shapely
 from shapely.geometry.base import BaseGeometry
 import shapely.prepared
 import shapely.strtree
@@ -171,6 +173,7 @@ class ShapeClassifier:
 
         # Set parent/child relationship for components
         self.__set_parent_relationships()
+        self.__text_finder.index_text_shapes(self.__shapes)
 
         # Assign text labels to components and source and target of connections
         for shape in self.__shapes:
@@ -282,25 +285,38 @@ class ShapeClassifier:
 
     def __set_parent_relationships(self):
     #====================================
-        parent_child = []
-        for geometry in self.__component_geometries:
-            if geometry.area > 0:
-                parent = self.__geometry_to_shape[id(geometry)]
-                bbox_intersecting_shapes = [self.__geometry_to_shape[id(self.__component_geometries[c])]
-                    for c in self.__component_index.query(geometry)
-                        if self.__component_geometries[c].area > 0]
-                for shape in bbox_intersecting_shapes:
-                    if parent.shape_type != SHAPE_TYPE.TEXT and parent.id != shape.id:
-                        # A text shape is always a child even when not properly contained
-                        if (shapely.contains_properly(parent.geometry, shape.geometry)
-                          or (shape.shape_type == SHAPE_TYPE.TEXT
-                          and parent.geometry.intersection(shape.geometry).area/shape.geometry.area > MIN_TEXT_INSIDE)):
-                            parent_child.append((parent, shape))
-        last_child_id = None
-        for (parent, child) in sorted(parent_child, key=lambda s: (s[1].id, s[0].geometry.area)):
-            # Sorted by child id with smallest parent first when there are multiple parents
-            if child.id != last_child_id:
-                child.add_parent(parent)
-                last_child_id = child.id
+        index_geometries = np.array(self.__component_geometries, dtype=object)
+        shapes = [self.__geometry_to_shape[id(geometry)] for geometry in self.__component_geometries]
+        if len(shapes) == 0:
+            return
+        geometries = np.array([shape.geometry for shape in shapes], dtype=object)
+        is_text = np.array([shape.shape_type == SHAPE_TYPE.TEXT for shape in shapes])
+        shape_ids = np.array([shape.id for shape in shapes], dtype=object)
+
+        # Candidate pairs are of shapes with intersecting bounding boxes in the index. Shapes
+        # may have been changed since being indexed, so predicates use their current geometry
+        (parents, children) = self.__component_index.query(index_geometries)
+        index_areas = shapely.area(index_geometries)
+        candidates = ((index_areas[parents] > 0) & (index_areas[children] > 0)
+                    & ~is_text[parents] & (shape_ids[parents] != shape_ids[children]))
+        parents = parents[candidates]
+        children = children[candidates]
+
+        # A text shape is always a child even when not properly contained
+        contained = shapely.contains_properly(geometries[parents], geometries[children])
+        text_pairs = ~contained & is_text[children]
+        text_inside = (shapely.area(shapely.intersection(geometries[parents[text_pairs]], geometries[children[text_pairs]]))
+                      /shapely.area(geometries[children[text_pairs]]))
+        contained[np.flatnonzero(text_pairs)[text_inside > MIN_TEXT_INSIDE]] = True
+        parents = parents[contained]
+        children = children[contained]
+
+        # Sort by child id with smallest parent first when there are multiple parents,
+        # and give each child its first parent
+        (_, child_rank) = np.unique(shape_ids[children], return_inverse=True)
+        order = np.lexsort((shapely.area(geometries[parents]), child_rank))
+        (_, first_pairs) = np.unique(child_rank[order], return_index=True)
+        for pair in order[first_pairs]:
+            shapes[children[pair]].add_parent(shapes[parents[pair]])
 
 #===============================================================================
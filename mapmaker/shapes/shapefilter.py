@@ -18,10 +18,8 @@
 #
 #===============================================================================
 
-from typing import Optional
-
-#===============================================================================
-
+import numpy as np
+import shapely
 from shapely.geometry.base import BaseGeometry
 import shapely.strtree
 
@@ -60,8 +58,8 @@ class CommonAttributes:
 
 class ShapeFilter:
     def __init__(self):
-        self.__excluded_shape_attributes = {}
-        self.__excluded_shape_geometries = []
+        self.__excluded_shape_attributes: list[CommonAttributes] = []
+        self.__excluded_shape_geometries: list[BaseGeometry] = []
         self.__excluded_shape_rtree = None
         self.__warn_create = False
         self.__warn_filter = False
@@ -72,7 +70,7 @@ class ShapeFilter:
         if geometry is not None and self.__excluded_shape_rtree is None:
             if 'Polygon' in geometry.geom_type:
                 self.__excluded_shape_geometries.append(geometry)
-                self.__excluded_shape_attributes[id(geometry)] = CommonAttributes(shape)
+                self.__excluded_shape_attributes.append(CommonAttributes(shape))
         elif not self.__warn_create:
             log.warning('Cannot add shapes to filter after it has been created...')
             self.__warn_create = True
@@ -90,38 +88,65 @@ class ShapeFilter:
 
     def filter(self, shape: Shape) -> bool:
     #======================================
-        if self.__excluded_shape_rtree is not None:
-            geometry = shape.geometry
-            if geometry is not None and 'Polygon' in geometry.geom_type:
-                if ((attribs := self.__shape_excluded(geometry)) is not None
-                 or (attribs := self.__shape_excluded(geometry, overlap=0.80)) is not None
-                 or (attribs := self.__shape_excluded(geometry, attributes=CommonAttributes(shape))) is not None):
-                    shape.properties['exclude'] = True
-                    shape.properties.update(attribs.as_dict())
-                    return True
-        elif not self.__warn_filter:
-            log.warning('Shape filter has not been created...')
-            self.__warn_filter = True
-        return False
-
-    def __shape_excluded(self, geometry: BaseGeometry, overlap=0.98, attributes=None, show=False) -> Optional[CommonAttributes]:
-    #===========================================================================================================================
-        if self.__excluded_shape_rtree is not None:
-            intersecting_shapes_indices = self.__excluded_shape_rtree.query(geometry)
-            for index in intersecting_shapes_indices:
-                g = self.__excluded_shape_geometries[index]
-                if g.intersects(geometry):
-                    if attributes is None:
-                        intersecting_area = g.intersection(geometry).area
-                        if (intersecting_area >= overlap*geometry.area
-                        and intersecting_area >= overlap*g.area):
-                            if show:
-                                log.info(f'Excluded by {100*overlap}% overlap')
-                            return self.__excluded_shape_attributes[id(g)]
-                    elif attributes == self.__excluded_shape_attributes[id(g)]:
-                        if show:
-                            log.info(f'Excluded by {attributes} match')
-                        return self.__excluded_shape_attributes[id(g)]
-        return None
+        return self.filter_shapes([shape])[0]
+
+    def filter_shapes(self, shapes: list[Shape]) -> list[bool]:
+    #==========================================================
+        """
+        Exclude shapes that are similar to those in the filter.
+
+        A shape is excluded if it overlaps a filter shape by 98%, or else by 80%,
+        or else intersects a filter shape with the same name, colour and opacity.
+        Excluded shapes are given the properties of the matching filter shape.
+
+        :returns: Whether each shape has been excluded
+        """
+        excluded = [False] * len(shapes)
+        if self.__excluded_shape_rtree is None:
+            if not self.__warn_filter:
+                log.warning('Shape filter has not been created...')
+                self.__warn_filter = True
+            return excluded
+        shape_indices = [n for n, shape in enumerate(shapes)
+                            if shape.geometry is not None and 'Polygon' in shape.geometry.geom_type]
+        if len(shape_indices) == 0:
+            return excluded
+        geometries = np.array([shapes[n].geometry for n in shape_indices], dtype=object)
+        filter_geometries = np.array(self.__excluded_shape_geometries, dtype=object)
+
+        # Find all intersecting pairs of shapes and filter shapes, and their overlaps, at once
+        (geometry_indices, filter_indices) = self.__excluded_shape_rtree.query(geometries, predicate='intersects')
+        intersecting_areas = shapely.area(shapely.intersection(filter_geometries[filter_indices],
+                                                               geometries[geometry_indices]))
+        geometry_areas = shapely.area(geometries)[geometry_indices]
+        filter_areas = shapely.area(filter_geometries)[filter_indices]
+        overlap_matches = {}
+        for overlap in [0.98, 0.80]:
+            overlap_matches[overlap] = ((intersecting_areas >= overlap*geometry_areas)
+                                      & (intersecting_areas >= overlap*filter_areas))
+
+        # Pairs are grouped by shape, with filter shapes in index query order
+        pair_groups = np.split(np.arange(len(geometry_indices)),
+                               np.flatnonzero(np.diff(geometry_indices)) + 1)
+        for pairs in pair_groups:
+            if len(pairs) == 0:
+                continue
+            shape_index = shape_indices[geometry_indices[pairs[0]]]
+            attribs = None
+            for overlap in [0.98, 0.80]:
+                if len(matched := pairs[overlap_matches[overlap][pairs]]):
+                    attribs = self.__excluded_shape_attributes[filter_indices[matched[0]]]
+                    break
+            if attribs is None:
+                shape_attributes = CommonAttributes(shapes[shape_index])
+                for pair in pairs:
+                    if shape_attributes == self.__excluded_shape_attributes[filter_indices[pair]]:
+                        attribs = self.__excluded_shape_attributes[filter_indices[pair]]
+                        break
+            if attribs is not None:
+                shapes[shape_index].properties['exclude'] = True
+                shapes[shape_index].properties.update(attribs.as_dict())
+                excluded[shape_index] = True
+        return excluded
 
 #===============================================================================
@@ -18,8 +18,14 @@
 #
 #===============================================================================
 
+from collections import defaultdict
+from functools import lru_cache
 import re
-from typing import Optional
+from typing import Iterable, Optional
+
+#===============================================================================
+
+import numpy as np
 
 #===============================================================================
 
@@ -28,16 +34,40 @@ from .constants import MAX_TEXT_VERTICAL_OFFSET, TEXT_BASELINE_OFFSET, TEXT_COMP
 
 #===============================================================================
 
+class TextShapes:
+    """
+    The text shapes of a parent shape, in the order they were seen, with their
+    baselines and text.
+    """
+    def __init__(self, shapes: list[Shape]):
+        order = np.argsort(np.array([shape.number for shape in shapes], dtype=int), kind='stable')
+        self.__shapes = [shapes[n] for n in order]
+        self.__baselines = [shape.baseline for shape in self.__shapes]
+        self.__texts = [shape.text for shape in self.__shapes]
+
+    @property
+    def baselines(self) -> list[float]:
+        return self.__baselines
+
+    @property
+    def shapes(self) -> list[Shape]:
+        return self.__shapes
+
+    @property
+    def texts(self) -> list[str]:
+        return self.__texts
+
+#===============================================================================
+
 class TextShapeCluster:
-    def __init__(self, shape: Optional[Shape]=None):
-        self.__shapes: list[Shape] = []
-        self.__baselines: float = 0
-        if shape is not None:
-            self.add_shape(shape)
+    def __init__(self, shapes: list[Shape], texts: list[str], baseline: float):
+        self.__shapes = shapes
+        self.__texts = texts
+        self.__baseline = baseline
 
     @property
     def baseline(self) -> float:
-        return self.__shapes[0].baseline
+        return self.__baseline
 
     @property
     def left(self) -> float:
@@ -47,12 +77,9 @@ class TextShapeCluster:
     def shapes(self) -> list[Shape]:
         return self.__shapes
 
-    def add_shape(self, shape: Shape):
-        self.__shapes.append(shape)
-        self.__baselines += shape.baseline
-
-    def left_sort_shapes(self):
-        self.__shapes.sort(key=lambda s: s.left)
+    @property
+    def text(self) -> str:
+        return ''.join(self.__texts).replace(' ', '\\ ')
 
 #===============================================================================
 
@@ -117,17 +144,48 @@ class LatexMaker:
 
 #===============================================================================
 
+LATEX_RE = re.compile(f'{SUBSCRIPT_CHAR}|\\{SUPERSCRIPT_CHAR}|{{')
+
+@lru_cache(maxsize=4096)
+def latex_from_text_parts(text_parts: tuple[tuple[str, int], ...]) -> str:
+#=========================================================================
+    # Text blocks are often repeated so we cache their LaTeX
+    latex = LatexMaker()
+    for (text, state) in text_parts:
+        latex.add_text(text, state)
+    return latex.latex
+
+#===============================================================================
+
 class TextFinder:
     def __init__(self, scaling: float):
-        self.__latex_re = re.compile(f'{SUBSCRIPT_CHAR}|\\{SUPERSCRIPT_CHAR}|{{')
         self.__max_text_vertical_offset = scaling * MAX_TEXT_VERTICAL_OFFSET
         self.__text_baseline_offset = scaling * TEXT_BASELINE_OFFSET
         self.__shape_scaling = 1.0
+        self.__text_shapes_by_parent: Optional[dict[int, TextShapes]] = None
+
+    def index_text_shapes(self, shapes: Iterable[Shape]):
+    #====================================================
+        """
+        Group text shapes by their parent, once all parent/child relationships
+        are known, so finding a shape's text doesn't have to scan its children.
+        """
+        text_shapes_by_parent: defaultdict[int, list[Shape]] = defaultdict(list)
+        for shape in shapes:
+            if shape.shape_type == SHAPE_TYPE.TEXT:
+                # A text shape is only indexed once for each of its parents
+                for parent_id in dict.fromkeys(id(parent) for parent in shape.parents):
+                    text_shapes_by_parent[parent_id].append(shape)
+        self.__text_shapes_by_parent = { parent: TextShapes(text_shapes)
+                                            for parent, text_shapes in text_shapes_by_parent.items() }
 
     def get_text(self, shape: Shape) -> Optional[tuple[str, list[Shape]]]:
     #=====================================================================
         self.__shape_scaling = shape.height/TEXT_COMPONENT_HEIGHT
-        text_shapes = [s for s in shape.children if s.shape_type == SHAPE_TYPE.TEXT]
+        if self.__text_shapes_by_parent is None:
+            text_shapes = TextShapes([s for s in shape.children if s.shape_type == SHAPE_TYPE.TEXT])
+        elif (text_shapes := self.__text_shapes_by_parent.get(id(shape))) is None:
+            return None
         text_clusters = self.__cluster_text(text_shapes)
         if len(text_clusters) == 0:
             return None
@@ -135,69 +193,67 @@ class TextFinder:
         baseline = text_clusters[0].baseline
         state = 0
         clusters = []
-        latex = LatexMaker()
+        text_parts = []
         used_text_shapes = []
         if len(text_clusters) == 1:
-            latex.add_text(self.__text_block_to_text(text_clusters[0].shapes), 0)
+            text_parts.append((text_clusters[0].text, 0))
             used_text_shapes.extend(text_clusters[0].shapes)
         else:
             for cluster in text_clusters:
                 if cluster.baseline < (baseline - offset):
                     if state > 0 and len(clusters):
-                        latex.add_text(self.__text_clusters_to_text(clusters), state)
+                        text_parts.append((self.__text_clusters_to_text(clusters), state))
                         clusters = []
                     clusters.append(cluster)
                     state = -1
                 elif cluster.baseline > (baseline + offset):
                     if state < 0 and len(clusters):
-                        latex.add_text(self.__text_clusters_to_text(clusters), state)
+                        text_parts.append((self.__text_clusters_to_text(clusters), state))
                         clusters = []
                     clusters.append(cluster)
                     state = 1
                 else:
                     if state != 0 and len(clusters):
-                        latex.add_text(self.__text_clusters_to_text(clusters), state)
+                        text_parts.append((self.__text_clusters_to_text(clusters), state))
                         clusters = []
-                    latex.add_text(self.__text_block_to_text(cluster.shapes), 0)
+                    text_parts.append((cluster.text, 0))
                     state = 0
                 used_text_shapes.extend(cluster.shapes)
         if len(clusters):
-            latex.add_text(self.__text_clusters_to_text(clusters), state)
-        text = f'${text}$' if self.__latex_re.search(text:=latex.latex) else text.replace('\\ ', ' ')
+            text_parts.append((self.__text_clusters_to_text(clusters), state))
+        text = latex_from_text_parts(tuple(text_parts))
+        text = f'${text}$' if LATEX_RE.search(text) else text.replace('\\ ', ' ')
         return (text, used_text_shapes) if text != '' else None
 
-    def __text_block_to_text(self, text_block: list[Shape]) -> str:
-    #==============================================================
-        return f'{''.join([s.text for s in text_block])}'.replace(' ', '\\ ')
-
     def __text_clusters_to_text(self, text_clusters: list[TextShapeCluster]) -> str:
     #===============================================================================
         baseline = text_clusters[0].baseline
         offset = 0.9*self.__shape_scaling*self.__max_text_vertical_offset
-        latex = LatexMaker()
+        text_parts = []
         for cluster in text_clusters:
             if cluster.baseline < (baseline - offset):
-                latex.add_text(self.__text_block_to_text(cluster.shapes), -1)
+                text_parts.append((cluster.text, -1))
             elif cluster.baseline > (baseline + offset):
-                latex.add_text(self.__text_block_to_text(cluster.shapes), 1)
+                text_parts.append((cluster.text, 1))
             else:
-                latex.add_text(self.__text_block_to_text(cluster.shapes), 0)
-        return latex.latex
+                text_parts.append((cluster.text, 0))
+        return latex_from_text_parts(tuple(text_parts))
 
-    def __cluster_text(self, text_shapes: list[Shape]) -> list[TextShapeCluster]:
-    #============================================================================
+    def __cluster_text(self, text_shapes: TextShapes) -> list[TextShapeCluster]:
+    #===========================================================================
+        # A new cluster starts when a shape's baseline is too far from the baseline
+        # of the first shape in the current cluster
         offset = self.__shape_scaling*self.__max_text_vertical_offset
-        shapes_seen_order = sorted(text_shapes, key=lambda s: s.number)
-        clusters: list[TextShapeCluster] = []
-        current_cluster = None
-        for shape in shapes_seen_order:
-            if (current_cluster is None
-             or abs(shape.baseline - current_cluster.baseline) > offset):
-                current_cluster = TextShapeCluster(shape)
-                clusters.append(current_cluster)
-            else:
-                current_cluster.add_shape(shape)
+        cluster_starts = []
+        cluster_baseline = None
+        for n, baseline in enumerate(text_shapes.baselines):
+            if cluster_baseline is None or abs(baseline - cluster_baseline) > offset:
+                cluster_starts.append(n)
+                cluster_baseline = baseline
+        for shape in text_shapes.shapes:
             shape.properties['exclude'] = True
-        return clusters
+        cluster_ends = cluster_starts[1:] + [len(text_shapes.shapes)]
+        return [TextShapeCluster(text_shapes.shapes[start:end], text_shapes.texts[start:end], text_shapes.baselines[start])
+                    for start, end in zip(cluster_starts, cluster_ends)]
 
 #===============================================================================
@@ -18,7 +18,8 @@
 #
 #===============================================================================
 
-from typing import Callable, Optional, TYPE_CHECKING
+import importlib
+from typing import IO, Callable, Optional, TYPE_CHECKING
 
 #===============================================================================
 
@@ -296,7 +297,7 @@ class MapSource(object):
 #===============================================================================
 
 class RasterSource(object):
-    def __init__(self, id: str, kind: str, get_data: Callable[[], bytes],
+    def __init__(self, id: str, kind: str, get_data: Callable[[], bytes|IO[bytes]],
                  map_source: MapSource, source_path: Optional[FilePath]=None,
                  background_layer: bool=False, transform: Optional[Transform]=None):
         self.__id = id
@@ -313,7 +314,7 @@ class RasterSource(object):
         return self.__background_layer
 
     @property
-    def data(self) -> bytes:
+    def data(self) -> bytes|IO[bytes]:
         if self.__data is None:
             self.__data = self.__get_data()
         return self.__data
@@ -340,11 +341,28 @@ class RasterSource(object):
 
 #===============================================================================
 
-# Export our sources here to avoid circular imports
+# Export our sources here to avoid circular imports. Sources are only
+# imported when first used, so that making a map doesn't load the
+# dependencies (e.g. ``pptx``) of kinds of source it doesn't have
 
-from .fc_powerpoint import FCPowerpointSource
-from .mbfbioscience import MBFSource
-from .powerpoint import PowerpointSource
-from .svg import SVGSource
+SOURCE_MODULES = {
+    'FCPowerpointSource': 'fc_powerpoint',
+    'MBFSource': 'mbfbioscience',
+    'PowerpointSource': 'powerpoint',
+    'SVGSource': 'svg',
+}
+
+if TYPE_CHECKING:
+    from .fc_powerpoint import FCPowerpointSource
+    from .mbfbioscience import MBFSource
+    from .powerpoint import PowerpointSource
+    from .svg import SVGSource
+
+def __getattr__(name: str):
+    if (module_name := SOURCE_MODULES.get(name)) is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    source_class = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = source_class
+    return source_class
 
 #===============================================================================
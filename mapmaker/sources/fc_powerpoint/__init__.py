@@ -133,8 +133,7 @@ class FCSlide(Slide):
             elif self.kind == 'layer':
                 # Exclude shapes from the layer if they are similar to those in the base layer.
                 # Excluded shapes have a ``global-shape`` property giving the matching base shape.
-                for shape in self.shapes.flatten(skip=1):
-                    self.__shape_filter.filter(shape)
+                self.__shape_filter.filter_shapes(list(self.shapes.flatten(skip=1)))
 
         self.__add_connections()
         return self.shapes
@@ -411,9 +410,8 @@ class FCSlide(Slide):
 
     def __add_connections(self):
     #===========================
-        for connection in self.__connections:
-            # First pass will join together sub-paths at joining nodes
-            self.__connection_classifier.add_connection(connection)
+        # First pass will join together sub-paths at joining nodes
+        self.__connection_classifier.add_connections(self.__connections)
 
         for connection in self.__connections:
             if connection.get_property('exclude'):
@@ -24,6 +24,8 @@ from typing import Any
 #===============================================================================
 
 import networkx as nx
+import numpy as np
+import shapely
 from shapely.geometry.linestring import LineString
 from shapely.geometry.point import Point
 import shapely.strtree
@@ -201,37 +203,68 @@ class ConnectionClassifier:
             else:
                 self.__connector_index = shapely.strtree.STRtree(self.__connector_geometries)
 
-    def __closest_connector_id(self, point: Point):
-    #==============================================
-        if self.__connector_index is not None:
-            closest_index = self.__connector_index.nearest(point)           # type: ignore
-            closest_geometry = self.__connector_geometries[closest_index]   # type: ignore
-            if closest_geometry.distance(point) < MAX_CONNECTION_GAP:
-                return self.__connector_ids_by_geometry[id(closest_geometry)]
-
-    def __crossed_component(self, connection: Shape):
-    #================================================
-        component_ids = set()
-        if self.__component_index is not None:
-            for index in self.__component_index.query(connection.geometry):
-                component_geometry = self.__component_geometries[index]
-                component = self.__components_by_geometry[id(component_geometry)]
-                if (connection.fc_class == component.fc_class
-                and component_geometry.intersection(connection.geometry).length > component.fc_mean_side):
-                    component_ids.add(component.global_shape.id)
+    def __closest_connector_ids(self, connections: list[Shape]) -> list[list[str|None]]:
+    #==================================================================================
+        # Find the connectors at both ends of all connections with a single nearest query
+        end_connector_ids: list[list[str|None]] = [[None, None] for _ in connections]
+        if self.__connector_index is not None and len(connections):
+            geometries = np.array([connection.geometry for connection in connections], dtype=object)
+            end_points = np.concatenate((shapely.get_point(geometries, 0), shapely.get_point(geometries, -1)))
+            (point_indices, connector_indices), distances = self.__connector_index.query_nearest(
+                end_points, max_distance=MAX_CONNECTION_GAP, return_distance=True, all_matches=False)
+            for point_index, connector_index, distance in zip(point_indices.tolist(),
+                                                              connector_indices.tolist(),
+                                                              distances.tolist()):
+                if distance < MAX_CONNECTION_GAP:
+                    connector_geometry = self.__connector_geometries[connector_index]
+                    end_connector_ids[point_index % len(connections)][point_index // len(connections)] = (
+                        self.__connector_ids_by_geometry[id(connector_geometry)])
+        return end_connector_ids
+
+    def __crossed_components(self, connections: list[Shape]) -> list[set[str]]:
+    #==========================================================================
+        component_ids: list[set[str]] = [set() for _ in connections]
+        if self.__component_index is not None and len(connections):
+            geometries = np.array([connection.geometry for connection in connections], dtype=object)
+            connection_indices, component_indices = self.__component_index.query(geometries, predicate='intersects')
+            components = [self.__components_by_geometry[id(self.__component_geometries[index])]
+                            for index in component_indices.tolist()]
+            same_class = np.array([connections[connection_index].fc_class == component.fc_class
+                                    for connection_index, component in zip(connection_indices.tolist(), components)],
+                                  dtype=bool)
+            crossing_lengths = np.zeros(len(components))
+            if same_class.any():
+                crossing_lengths[same_class] = shapely.length(shapely.intersection(
+                    self.__component_index.geometries[component_indices[same_class]],
+                    geometries[connection_indices[same_class]]))
+            mean_sides = np.array([component.fc_mean_side for component in components], dtype=float)
+            for n in np.flatnonzero(same_class & (crossing_lengths > mean_sides)).tolist():
+                component_ids[connection_indices[n]].add(components[n].global_shape.id)
         return component_ids
 
-    def add_connection(self, connection: Shape):
-    #===========================================
-        self.__check_indexes(connection)
-
+    def add_connections(self, connections: list[Shape]):
+    #===================================================
+        for connection in connections:
+            self.__check_indexes(connection)
+        crossing_connections = []
+        for connection, end_connector_ids in zip(connections, self.__closest_connector_ids(connections)):
+            if self.__add_connection(connection, end_connector_ids):
+                crossing_connections.append(connection)
+        # A connection's geometry is final once it has been added, so components
+        # it crosses can be found for all connections together
+        for connection, component_ids in zip(crossing_connections,
+                                             self.__crossed_components(crossing_connections)):
+            connection.intermediate_components = list(component_ids)
+
+    def __add_connection(self, connection: Shape, end_connector_ids: list[str|None]) -> bool:
+    #=======================================================================================
         # First find connectors at the end of the connection
         connected_end_ids = []
         free_end_connectors = []
         connection_end_index = {}
-        for coord_index in [0, -1]:
+        for end_index, coord_index in enumerate([0, -1]):
             end_point = Point(connection.geometry.coords[coord_index])
-            if (connector_id := self.__closest_connector_id(end_point)) is not None:
+            if (connector_id := end_connector_ids[end_index]) is not None:
                 connected_end_ids.append(connector_id)
             else:
                 ## Add a JOIN connector if the end point has no connector
@@ -284,7 +317,7 @@ class ConnectionClassifier:
         # Only add drawn connections if not using NPO connectivity
         if connection.fc_class == FC_CLASS.NEURAL and settings.get('NPO', False):
             connection.set_property('exclude', True)
-            return
+            return False
 
         if connection.fc_class == FC_CLASS.NEURAL:
             connection.fc_kind = FC_KIND.NEURON
@@ -382,7 +415,6 @@ class ConnectionClassifier:
                 systems.update(system_ids(connector))
             connection.set_property('system-ids', systems)
 
-        connection.intermediate_components = list(self.__crossed_component(connection))
         if connection.fc_class == FC_CLASS.NEURAL:
             self.__neural_graph.add_connection(connection)
         elif connection.fc_class == FC_CLASS.VASCULAR:
@@ -395,4 +427,6 @@ class ConnectionClassifier:
         # NODES have max 2 connections
         # JOINS have max 2 connections
 
+        return True
+
 #===============================================================================
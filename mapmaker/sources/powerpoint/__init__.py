@@ -18,8 +18,15 @@
 #
 #===============================================================================
 
-from io import BytesIO
 import pathlib
+import pickle
+import queue
+import traceback
+from typing import IO
+
+#===============================================================================
+
+import multiprocess as mp
 
 #===============================================================================
 
@@ -29,7 +36,7 @@ from mapmaker.flatmap.layers import FEATURES_TILE_LAYER, MapLayer
 from mapmaker.knowledgebase.celldl import CD_CLASS
 from mapmaker.settings import settings, MAP_KIND
 from mapmaker.shapes import Shape
-from mapmaker.utils import log, TreeList
+from mapmaker.utils import CPU_COUNT, log, ProgressBar, TreeList
 
 from .. import MapSource, RasterSource, PATHWAYS_TILE_LAYER
 
@@ -165,6 +172,7 @@ class PowerpointSource(MapSource):
 
     def process(self):
     #=================
+        self.__get_shape_geometries()
         for (n, id), slide in self.__slides.items():
             slide_layer = PowerpointLayer(self, id, slide, n)
             log.info(f'Slide {n}, {slide_layer.id}')
@@ -176,19 +184,78 @@ class PowerpointSource(MapSource):
         if 'exportSVG' in settings:
             self.__make_svg()
 
+    def __get_shape_geometries(self):
+    #================================
+        # Getting the geometries of shapes is independent of other slides so is
+        # done for all slides in parallel. Slides are then processed in order,
+        # using the geometries, so the map is the same as when done serially.
+        slides = list(self.__slides.values())
+        processes = min(settings.get('slideProcesses', CPU_COUNT), len(slides))
+        if processes < 2 or 'fork' not in mp.get_all_start_methods():
+            return
+        # Worker processes are forked so they share the presentation with this process
+        context = mp.get_context('fork')
+        result_queue = context.Queue()
+        workers = []
+        for worker_number in range(processes):
+            slide_indices = list(range(worker_number, len(slides), processes))
+            worker = context.Process(target=self.__shape_geometries_process,
+                                     args=(slides, slide_indices, result_queue),
+                                     name=f'Slides-{worker_number}')
+            worker.start()
+            workers.append(worker)
+
+        progress_bar = ProgressBar(total=len(slides), unit='sld',
+            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} slides, {postfix}')
+        shape_count = 0
+        remaining = len(slides)
+        while remaining > 0:
+            try:
+                (index, pickled_geometries, error) = result_queue.get(timeout=1)
+            except queue.Empty:
+                if any(worker.is_alive() for worker in workers) or not result_queue.empty():
+                    continue
+                break
+            # Slides without geometries get them when they are processed
+            if pickled_geometries is not None:
+                try:
+                    shape_geometries = pickle.loads(pickled_geometries)
+                    slides[index].set_shape_geometries(shape_geometries)
+                    shape_count += len(shape_geometries)
+                except Exception:
+                    error = traceback.format_exc()
+            if error is not None:
+                log.warning('Cannot get shape geometries in parallel', slide=slides[index].id, error=error)
+            progress_bar.set_postfix(f'{shape_count} shapes')
+            progress_bar.update(1)
+            remaining -= 1
+        progress_bar.close()
+        for worker in workers:
+            worker.join()
+
+    def __shape_geometries_process(self, slides: list[Slide], slide_indices: list[int], result_queue):
+    #================================================================================================
+        for index in slide_indices:
+            # Errors are logged by the main process
+            try:
+                pickled_geometries = pickle.dumps(slides[index].get_shape_geometries())
+                error = None
+            except Exception:
+                pickled_geometries = None
+                error = traceback.format_exc()
+            result_queue.put((index, pickled_geometries, error))
+
     def get_raster_sources(self) -> list[RasterSource]:
     #==================================================
         if self.kind == 'base':  # Only rasterise base source layer
             return [RasterSource(f'{self.id}_image', 'svg', self.__get_raster_data, self)]
         return []
 
-    def __get_raster_data(self) -> bytes:
-    #====================================
-        svg_maker = SvgMaker(self.__powerpoint)
+    def __get_raster_data(self) -> IO[bytes]:
+    #========================================
+        svg_maker = SvgMaker(self.__powerpoint, stream_slides=True)
         svg_maker.add_slides(self.__slides)
-        svg_data = BytesIO(svg_maker.svg_bytes())
-        svg_data.seek(0)
-        return svg_data.read()
+        return svg_maker.svg_file()
 
     def __make_svg(self):
     #====================
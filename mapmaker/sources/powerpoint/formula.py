@@ -22,8 +22,9 @@
 
 #===============================================================================
 
+from functools import lru_cache
 import math
-from typing import Optional
+from typing import Any, Callable, Optional
 
 #===============================================================================
 
@@ -134,29 +135,48 @@ class Evaluator(object):
 
     @staticmethod
     def evaluate(expr, context):
-        args = expr.split()
-        return Evaluator.formulae[args[0]](context.evaluate, *args[1:])
+        (formula, args) = compile_formula(expr)
+        return formula(context.evaluate, *args)
+
+#===============================================================================
+
+@lru_cache(maxsize=None)
+def compile_formula(expr: str) -> tuple[Callable[..., float], tuple[str, ...]]:
+#==============================================================================
+    args = expr.split()
+    return (Evaluator.formulae[args[0]], tuple(args[1:]))
+
+@lru_cache(maxsize=None)
+def parse_number(x) -> Optional[float]:
+#======================================
+    try: return float(x)
+    except ValueError: return None
 
 #===============================================================================
 
 class Geometry(object):
     def __init__(self, shape):
         self.__xfrm = shape.element.xfrm
+        # Values of evaluated guides and expressions are fixed for a shape
+        self.__values: dict[Any, float] = {}
 
         if shape.shape_type in [MSO_SHAPE_TYPE.AUTO_SHAPE, MSO_SHAPE_TYPE.TEXT_BOX]:    # type: ignore
             self.__shape_kind = shape.element.prstGeom.attrib['prst']
             self.__geometry = PresetShapes.lookup(self.__shape_kind)
+            guides = PresetShapes.guides(self.__shape_kind)
             adjustments = shape.element.prstGeom.avLst
 
         elif shape.shape_type == MSO_SHAPE_TYPE.FREEFORM:                               # type: ignore
             self.__shape_kind = 'freeform'
             self.__geometry = shape.element.spPr.custGeom
+            guides = PresetShapes.geometry_guides(self.__geometry)
             adjustments = None
 
         elif (shape.shape_type == MSO_SHAPE_TYPE.PICTURE                                # type: ignore
            or isinstance(shape, pptx.shapes.connector.Connector)):
             self.__shape_kind = shape.element.spPr.prstGeom.attrib['prst']
             self.__geometry = PresetShapes.lookup(self.__shape_kind)
+            guides = PresetShapes.guides(self.__shape_kind)
             adjustments = shape.element.spPr.prstGeom.avLst
 
         else:
@@ -169,14 +189,7 @@ class Geometry(object):
             'w': shape.width,
             'h': shape.height
         }
-
-        if self.__geometry.gdLst is not None:
-            for gd in self.__geometry.gdLst:
-                self.__variables[gd.name] = gd.fmla
-
-        if self.__geometry.avLst is not None:
-            for gd in self.__geometry.avLst:
-                self.__variables[gd.name] = gd.fmla
+        self.__variables.update(guides)
 
         if adjustments is not None:
             for gd in adjustments:
@@ -198,13 +211,16 @@ class Geometry(object):
         return self.__xfrm
 
     def evaluate(self, x):
-        try: return float(x)
-        except ValueError: pass
-        try: return self.evaluate(PRESET_VARIABLES[x])
-        except KeyError: pass
-        try: return self.evaluate(self.__variables[x])
-        except KeyError: pass
-        return Evaluator.evaluate(x, self)
+        if (value := self.__values.get(x)) is None:
+            if (value := parse_number(x)) is None:
+                if x in PRESET_VARIABLES:
+                    value = self.evaluate(PRESET_VARIABLES[x])
+                elif x in self.__variables:
+                    value = self.evaluate(self.__variables[x])
+                else:
+                    value = Evaluator.evaluate(x, self)
+            self.__values[x] = value
+        return value
 
     def point(self, pt):
         return (self.evaluate(pt.attrib['x']), self.evaluate(pt.attrib['y']))
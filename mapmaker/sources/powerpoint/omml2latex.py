@@ -19,27 +19,64 @@
 #===============================================================================
 
 import importlib.resources
+import os
+from typing import Optional, TYPE_CHECKING
 
 #===============================================================================
 
-from saxonche import PySaxonProcessor
+# ``saxonche`` is only imported when the first equation is converted
+if TYPE_CHECKING:
+    from saxonche import PySaxonProcessor, PyXsltExecutable
 
 #===============================================================================
 
+class OpenMathConverter:
+    """
+    Convert Office MathML (OMML) to LaTeX, via MathML, using XSLT stylesheets that
+    are compiled once, when the first equation is converted.
+
+    Results are cached, keyed by the OMML text of an equation.
+    """
+    def __init__(self):
+        self.__pid: Optional[int] = None
+        self.__processor: Optional['PySaxonProcessor'] = None
+        self.__omml2mathml: Optional['PyXsltExecutable'] = None
+        self.__mathml2latex: Optional['PyXsltExecutable'] = None
+        self.__latex_cache: dict[str, str] = {}
+
+    def __compile_stylesheets(self):
+    #===============================
+        # A Saxon processor can't be shared with a forked process so each process has its own
+        if self.__pid != os.getpid():
+            from saxonche import PySaxonProcessor
+            processor = PySaxonProcessor(license=False)
+            omml_proc = processor.new_xslt30_processor()
+            self.__omml2mathml = omml_proc.compile_stylesheet(
+                stylesheet_file=str(importlib.resources.files('resources').joinpath('xsl/omml2mathml.xsl')))
+            mathml_proc = processor.new_xslt30_processor()
+            mathml_proc.set_cwd(
+                str(importlib.resources.files('resources').joinpath('xsl/mathml2latex/')))
+            self.__mathml2latex = mathml_proc.compile_stylesheet(stylesheet_file='mmltex.xsl')
+            self.__processor = processor
+            self.__pid = os.getpid()
+
+    def latex(self, openmathml: str) -> str:
+    #=======================================
+        if (latex := self.__latex_cache.get(openmathml)) is None:
+            self.__compile_stylesheets()
+            assert self.__processor is not None and self.__omml2mathml is not None and self.__mathml2latex is not None
+            # Transform OpenMath to Latex via MathML
+            mathml = self.__omml2mathml.transform_to_string(xdm_node=self.__processor.parse_xml(xml_text=openmathml))
+            latex = self.__mathml2latex.transform_to_string(xdm_node=self.__processor.parse_xml(xml_text=mathml))
+            self.__latex_cache[openmathml] = latex
+        return latex
+
+#===============================================================================
+
+__converter = OpenMathConverter()
+
 def openmath2latex(openmathml: str) -> str:
-    with PySaxonProcessor(license=False) as proc:
-        # Load stylesheets
-        omml_proc = proc.new_xslt30_processor()
-        omml2mathml = omml_proc.compile_stylesheet(
-            stylesheet_file=str(importlib.resources.files('resources').joinpath('xsl/omml2mathml.xsl')))
-        mathml_proc = proc.new_xslt30_processor()
-        mathml_proc.set_cwd(
-            str(importlib.resources.files('resources').joinpath('xsl/mathml2latex/')))
-        mathml2latex = mathml_proc.compile_stylesheet(stylesheet_file='mmltex.xsl')
-        # Transform OpenMath to Latex via MathML
-        mathml = omml2mathml.transform_to_string(xdm_node=proc.parse_xml(xml_text=openmathml))
-        latex = mathml2latex.transform_to_string(xdm_node=proc.parse_xml(xml_text=mathml))
-    return latex
+    return __converter.latex(openmathml)
 
 #===============================================================================
 
@@ -88,6 +125,6 @@ if __name__ == '__main__':
   </m:oMath>
 </m:oMathPara>
 '''
-    print(latex(omml))      # Expect ${𝑷}_{𝒊}$
+    print(openmath2latex(omml))      # Expect ${𝑷}_{𝒊}$
 
 #===============================================================================
@@ -19,7 +19,7 @@
 #===============================================================================
 
 import base64
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 #===============================================================================
 
@@ -72,6 +72,27 @@ STROKE_WIDTH_SCALE_FACTOR = 1270.0
 # (colour, opacity)
 ColourPair = tuple[Optional[str], float]
 
+# A shape's geometry along with the properties set when getting it
+type ShapeGeometry = tuple[Optional[BaseGeometry], dict[str, Any]]
+
+#===============================================================================
+
+GEOMETRY_SHAPE_TYPES = [
+    MSO_SHAPE_TYPE.AUTO_SHAPE,      # type: ignore
+    MSO_SHAPE_TYPE.FREEFORM,        # type: ignore
+    MSO_SHAPE_TYPE.TEXT_BOX,        # type: ignore
+    MSO_SHAPE_TYPE.LINE,            # type: ignore
+    MSO_SHAPE_TYPE.PICTURE          # type: ignore
+]
+
+SHAPE_GEOMETRY_PROPERTIES = [
+    'bezier-segments',
+    'closed',
+    'shape-kind',
+    'svg-element',
+    'svg-kind'
+]
+
 #===============================================================================
 
 class Slide:
@@ -97,6 +118,7 @@ class Slide:
         self.__transform = transform
         self.__shapes = TreeList()
         self.__shapes_by_id: dict[str, Shape] = {}
+        self.__shape_geometries: Optional[dict[int, ShapeGeometry]] = None
 
     @property
     def colour_map(self) -> ColourMap:
@@ -159,8 +181,57 @@ class Slide:
         self.__shapes = TreeList([self.__new_shape('root', self.__geometry, {'type': SHAPE_TYPE.GROUP})])
         self.__shapes.extend(self.__process_pptx_shapes(self.__pptx_slide.shapes,      # type: ignore
                                                         self.__transform, show_progress=True))
+        self.__shape_geometries = None
         return self.__shapes
 
+    def get_shape_geometries(self) -> dict[int, ShapeGeometry]:
+    #==========================================================
+        """
+        Get the geometries of the slide's shapes, keyed by shape id, along with
+        the properties that are set when getting them.
+
+        Shapes whose id isn't unique in the slide are left out.
+        """
+        shape_geometries: dict[int, ShapeGeometry] = {}
+        duplicate_ids: set[int] = set()
+        self.__get_shape_geometries(self.__pptx_slide.shapes, self.__transform,     # type: ignore
+                                    shape_geometries, duplicate_ids)
+        for shape_id in duplicate_ids:
+            del shape_geometries[shape_id]
+        return shape_geometries
+
+    def set_shape_geometries(self, shape_geometries: dict[int, ShapeGeometry]):
+    #==========================================================================
+        """
+        Use previously found shape geometries when the slide is next processed.
+        """
+        self.__shape_geometries = shape_geometries
+
+    def __get_shape_geometries(self, pptx_shapes: PptxGroupShapes | PptxSlideShapes, transform: Transform,
+                               shape_geometries: dict[int, ShapeGeometry], duplicate_ids: set[int]):
+    #======================================================================================================
+        for pptx_shape in pptx_shapes:
+            if pptx_shape.shape_type in GEOMETRY_SHAPE_TYPES:
+                shape_name = pptx_shape.name
+                properties = parse_markup(shape_name) if shape_name.startswith('.') else {}
+                geometry = get_shape_geometry(pptx_shape, transform, properties)
+                if pptx_shape.shape_id in shape_geometries:
+                    duplicate_ids.add(pptx_shape.shape_id)
+                shape_geometries[pptx_shape.shape_id] = (geometry, {key: properties[key] for key in SHAPE_GEOMETRY_PROPERTIES})
+            elif pptx_shape.shape_type == MSO_SHAPE_TYPE.GROUP:             # type: ignore
+                self.__get_shape_geometries(pptx_shape.shapes,              # type: ignore
+                                            transform@DrawMLTransform(pptx_shape),
+                                            shape_geometries, duplicate_ids)
+
+    def __shape_geometry(self, pptx_shape, transform: Transform, properties: dict[str, Any]) -> Optional[BaseGeometry]:
+    #=================================================================================================================
+        if (self.__shape_geometries is not None
+        and (shape_geometry := self.__shape_geometries.get(pptx_shape.shape_id)) is not None):
+            (geometry, geometry_properties) = shape_geometry
+            properties.update(geometry_properties)
+            return geometry
+        return get_shape_geometry(pptx_shape, transform, properties)
+
     def __get_colour(self, shape: PptxConnector | PptxGroupShape | PptxShape,
                      group_colour: Optional[ColourPair]=None) -> ColourPair:
     #=======================================================================
@@ -339,7 +410,7 @@ class Slide:
                 shape_properties['colour'] = colour
                 if alpha < 1.0:
                     shape_properties['opacity'] = alpha
-                if good_geometry(geometry := get_shape_geometry(pptx_shape, transform, shape_properties)):
+                if good_geometry(geometry := self.__shape_geometry(pptx_shape, transform, shape_properties)):
                     shape_xml = etree.fromstring(pptx_shape.element.xml)
                     for link_ref in shape_xml.findall('.//a:hlinkClick',
                                                     namespaces=PPTX_NAMESPACE):
@@ -378,7 +449,7 @@ class Slide:
             elif pptx_shape.shape_type == MSO_SHAPE_TYPE.GROUP:             # type: ignore
                 shapes.append(self.__process_group(pptx_shape, transform))  # type: ignore
             elif pptx_shape.shape_type == MSO_SHAPE_TYPE.PICTURE:           # type: ignore
-                if good_geometry(geometry := get_shape_geometry(pptx_shape, transform, shape_properties)):
+                if good_geometry(geometry := self.__shape_geometry(pptx_shape, transform, shape_properties)):
                     shape = self.__new_shape(pptx_shape.shape_id, geometry, shape_properties, SHAPE_TYPE.IMAGE)
                     bbox = geometry.bounds                      # type: ignore
                     image_pos = (bbox[0], bbox[1])
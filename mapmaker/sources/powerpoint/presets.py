@@ -114,6 +114,7 @@ oxml.register_element_cls("drawml:presetShape", PresetShape)
 
 class PresetShapes(object):
     definitions_ = {}
+    guides_: dict[str, dict[str, str]] = {}
 
     with open(os.path.join(os.path.dirname(__file__), 'presetShapeDefinitions.xml'), 'rb') as defs:
         for defn in PresetShapeDefinition.new(defs.read()):
@@ -124,6 +125,25 @@ class PresetShapes(object):
     def lookup(name):
         return PresetShapes.definitions_[name]
 
+    @staticmethod
+    def guides(name) -> dict[str, str]:
+        # A preset's guide formulae are only found once
+        if (guides := PresetShapes.guides_.get(name)) is None:
+            guides = PresetShapes.geometry_guides(PresetShapes.lookup(name))
+            PresetShapes.guides_[name] = guides
+        return guides
+
+    @staticmethod
+    def geometry_guides(geometry) -> dict[str, str]:
+        guides = {}
+        if geometry.gdLst is not None:
+            for gd in geometry.gdLst:
+                guides[gd.name] = gd.fmla
+        if geometry.avLst is not None:
+            for gd in geometry.avLst:
+                guides[gd.name] = gd.fmla
+        return guides
+
 #===============================================================================
 #===============================================================================
 
@@ -18,9 +18,12 @@
 #
 #===============================================================================
 
-from io import StringIO
+import codecs
+from io import SEEK_END
 from math import sqrt
-from typing import Any, Optional
+import shutil
+import tempfile
+from typing import IO, Any, Optional
 import xml.etree.ElementTree as ET
 
 #===============================================================================
@@ -74,6 +77,11 @@ MIN_STROKE_WIDTH = 0.5
 
 TEXT_MARGINS = (6, 0)   # pixels
 
+# Slides' SVG is kept in memory until it reaches this size and is then spooled to disk
+SVG_SPOOL_SIZE = 64*1024*1024
+
+SVG_XML_DECLARATION = '<?xml version="1.0" encoding="utf-8" ?>\n'
+
 #===============================================================================
 
 def text_alignment(shape: PptxShape):
@@ -259,12 +267,12 @@ class SvgFromSlide:
         self.__colour_map = slide.colour_map
         self.__gradient_id = 0
 
-    def process_slide_svgs(self):
-    #============================
+    def process_slide_svgs(self) -> SvgGroup:
+    #=======================================
         slide_group = SvgGroup(id=svg_id(self.__slide_id), class_=css_class(CD_CLASS.LAYER))
         slide_group.set_desc(title=name_from_id(self.__slide_id))
         self.__process_shape_list(self.__slide.shapes[1:], slide_group)     # shapes[0] is entire slide
-        self.__drawing.add(slide_group)
+        return slide_group
 
     def __process_group(self, group: TreeList, svg_parent: SvgElement):
     #==================================================================
@@ -547,7 +555,14 @@ class SvgFromSlide:
 #===============================================================================
 
 class SvgMaker:
-    def __init__(self, powerpoint: Powerpoint, base_maker=None):
+    """
+    Make the SVG of a Powerpoint's slides.
+
+    When ``stream_slides`` is set, as when the SVG is only rasterised, slides are
+    serialised as they are added and not kept in the drawing, and the SVG isn't
+    pretty printed.
+    """
+    def __init__(self, powerpoint: Powerpoint, base_maker=None, stream_slides: bool=False):
         if base_maker is None:
             self.__drawing = SvgDrawing(size=None)
             add_marker_definitions(self.__drawing)
@@ -564,10 +579,13 @@ class SvgMaker:
             self.__drawing.attribs['viewBox'] = f'0 0 {svg_size[0]} {svg_size[1]}'
             self.__transform_matrix = svgelements.Matrix(T.svg_matrix)
             self.__celldl = CellDLGraph() if 'exportSVG' in settings else None
+            # Streamed slides are added to the drawing as serialised SVG, in a spooled file
+            self.__slides_svg = tempfile.SpooledTemporaryFile(max_size=SVG_SPOOL_SIZE) if stream_slides else None
         else:
             self.__celldl = base_maker.__celldl
             self.__drawing = base_maker.__drawing
             self.__transform_matrix = base_maker.__transform_matrix
+            self.__slides_svg = base_maker.__slides_svg
 
     def add_slides(self, slides: dict[tuple[int, str], Slide]):
     #==========================================================
@@ -575,23 +593,44 @@ class SvgMaker:
             # in a group...
             slide_svg_maker = SvgFromSlide(id, slide, self.__drawing, self.__transform_matrix,
                                            celldl=self.__celldl)  ## flip_text
-            slide_svg_maker.process_slide_svgs()
+            slide_group = slide_svg_maker.process_slide_svgs()
+            if self.__slides_svg is None:
+                self.__drawing.add(slide_group)
+            else:
+                self.__slides_svg.write(slide_group.tostring().encode('utf-8'))
 
-    def save(self, file_object):
-    #===========================
+    def save(self, file_object: IO[str]):
+    #====================================
         if self.__celldl is not None:
             self.__drawing.set_desc(desc='CellDL Metadata')
             self.__drawing.elements[0].xml.attrib['data-metadata-format'] = 'text/turtle'
             self.__drawing.elements[0].xml.attrib['data-metadata'] = self.__celldl.as_encoded_turtle()
             self.__drawing.set_metadata(ET.fromstring(self.__celldl.as_xml()))
-        self.__drawing.write(file_object, pretty=True, indent=4)
-
-    def svg_bytes(self):
-    #===================
-        svg = StringIO()
-        self.__drawing.write(svg)
-        svg_bytes = svg.getvalue().encode('utf-8')
-        svg.close()
-        return svg_bytes
+        if self.__slides_svg is None:
+            self.__drawing.write(file_object, pretty=True, indent=4)
+        else:
+            shutil.copyfileobj(codecs.getreader('utf-8')(self.svg_file()), file_object)
+
+    def svg_file(self) -> IO[bytes]:
+    #===============================
+        """
+        Get the SVG of the drawing and its slides, as a spooled file
+        positioned at its start.
+        """
+        svg_file = tempfile.SpooledTemporaryFile(max_size=SVG_SPOOL_SIZE)
+        svg_file.write(SVG_XML_DECLARATION.encode('utf-8'))
+        svg = self.__drawing.tostring()
+        if self.__slides_svg is None:
+            svg_file.write(svg.encode('utf-8'))
+        else:
+            # Streamed slides go where the drawing's end tag is
+            end_tag = svg.rindex('</svg>')
+            svg_file.write(svg[:end_tag].encode('utf-8'))
+            self.__slides_svg.seek(0)
+            shutil.copyfileobj(self.__slides_svg, svg_file)
+            self.__slides_svg.seek(0, SEEK_END)
+            svg_file.write(svg[end_tag:].encode('utf-8'))
+        svg_file.seek(0)
+        return svg_file                                     # type: ignore
 
 #===============================================================================
@@ -52,8 +52,8 @@ from .. import MapSource, RasterSource
 from .. import WORLD_METRES_PER_PIXEL
 from ..celldl import CellDLExporter
 
-from .cleaner import SVGCleaner
-from .definitions import DefinitionStore, ObjectStore
+from .cleaner import SVGCleaner, SVGExclusions
+from .definitions import DefinitionStore, ObjectStore, PathGeometry
 from .styling import StyleMatcher, wrap_element
 from .transform import SVGTransform
 from .utils import circle_from_bounds, geometry_from_svg_path, length_as_pixels
@@ -173,7 +173,8 @@ class SVGSource(MapSource):
     #========================
         # Save a cleaned copy of the SVG in the map's output directory. Call after
         # connectivity has been generated otherwise no paths will be in the saved SVG
-        cleaner = SVGCleaner(self.__source_file, self.flatmap.properties_store, all_layers=True)
+        cleaner = SVGCleaner(self.__source_file, self.flatmap.properties_store, all_layers=True,
+                             exclusions=self.__layer.exclusions)
         cleaner.clean()
         cleaner.add_connectivity_group(self.flatmap, self.__transform)
         cleaned_svg = self.flatmap.full_filename(f'images/{self.flatmap.id}.svg')
@@ -195,7 +196,8 @@ class SVGSource(MapSource):
 
     def __get_raster_data(self) -> bytes:
     #====================================
-        cleaner = SVGCleaner(self.__source_file, self.flatmap.properties_store, all_layers=False)
+        cleaner = SVGCleaner(self.__source_file, self.flatmap.properties_store, all_layers=False,
+                             exclusions=self.__layer.exclusions)
         cleaner.clean()
         cleaned_svg = tempfile.TemporaryFile()
         cleaner.save(cleaned_svg)
@@ -212,10 +214,15 @@ class SVGLayer(MapLayer):
         self.__transform = source.transform
         self.__definitions = DefinitionStore()
         self.__clip_geometries = ObjectStore()
+        self.__exclusions = SVGExclusions()
         if self.flatmap.map_kind == MAP_KIND.FUNCTIONAL:
             # Include layer id with shape id when setting feature id
             Shape.reset_shape_id(prefix=f'{id}/')
 
+    @property
+    def exclusions(self) -> SVGExclusions:
+        return self.__exclusions
+
     @property
     def source(self) -> SVGSource:
         return typing.cast(SVGSource, super().source)
@@ -272,6 +279,13 @@ class SVGLayer(MapLayer):
         self.add_group_features(f'SVG_{depth}', features, outermost=(depth==0))
         return features
 
+    def __properties_from_markup(self, markup: str) -> dict:
+    #======================================================
+        properties = self.source.properties_from_markup(markup)
+        # Note if elements with the markup are to be excluded when cleaning the SVG
+        self.__exclusions.add_markup(markup, properties)
+        return properties
+
     def __get_transform(self, wrapped_element) -> Transform:
     #=======================================================
         element_style = self.__style_matcher.element_style(wrapped_element)
@@ -312,7 +326,7 @@ class SVGLayer(MapLayer):
             pruned = True
         if pruned:
             markup = svg_markup(group)
-            properties_from_markup = self.source.properties_from_markup(markup)
+            properties_from_markup = self.__properties_from_markup(markup)
             properties.update(properties_from_markup)
         group_id = properties.get('id')
         group_style = self.__style_matcher.element_style(wrapped_group, parent_style)
@@ -349,6 +363,7 @@ class SVGLayer(MapLayer):
         for wrapped_element in children:
             progress_bar.update(1)
             element = wrapped_element.etree_element
+            definition_id = None
             if (element.tag is etree.Comment
              or element.tag is etree.PI
              or element.tag in IGNORED_SVG_TAGS):
@@ -357,11 +372,13 @@ class SVGLayer(MapLayer):
                 self.__add_definitions(element, transform)
                 continue
             elif element.tag == SVG_TAG('use'):
+                definition_id = self.__definitions.use_id(element)
                 element = self.__definitions.use(element)
                 wrapped_element = wrap_element(element)
             if element is not None and element.tag == SVG_TAG('clipPath'):
                 self.__add_clip_geometry(element, transform)
-            elif (shape := self.__process_element(wrapped_element, transform, parent_properties, parent_style)) is not None:
+            elif (shape := self.__process_element(wrapped_element, transform, parent_properties, parent_style,
+                                                  definition_id)) is not None:
                 shapes.append(shape)
         progress_bar.close()
         return shapes
@@ -387,24 +404,27 @@ class SVGLayer(MapLayer):
     #====================================================================================
         geometries = []
         for element in clip_path_element:
+            definition_id = None
             if element.tag == SVG_TAG('use'):
+                definition_id = self.__definitions.use_id(element)
                 element = self.__definitions.use(element)
             if (element is not None
             and element.tag in [SVG_TAG('circle'), SVG_TAG('ellipse'), SVG_TAG('line'),
                                SVG_TAG('path'), SVG_TAG('polyline'), SVG_TAG('polygon'),
                                SVG_TAG('rect')]):
                 properties = {}
-                geometry = self.__get_geometry(element, properties, transform)
+                geometry = self.__get_geometry(element, properties, transform, definition_id)
                 if geometry is not None:
                     geometries.append(geometry)
         return shapely.ops.unary_union(geometries) if len(geometries) else None
 
-    def __process_element(self, wrapped_element: ElementWrapper, transform, parent_properties, parent_style) -> Optional[Shape|TreeList[Shape]]:
-    #===========================================================================================================================================
+    def __process_element(self, wrapped_element: ElementWrapper, transform, parent_properties, parent_style,
+                          definition_id: Optional[str]=None) -> Optional[Shape|TreeList[Shape]]:
+    #=======================================================================================================
         element = wrapped_element.etree_element
         element_style = self.__style_matcher.element_style(wrapped_element, parent_style)
         markup = svg_markup(element)
-        properties_from_markup = self.source.properties_from_markup(markup)
+        properties_from_markup = self.__properties_from_markup(markup)
         properties = parent_properties.copy()
         for name in NON_INHERITED_PROPERTIES:
             properties.pop(name, None)
@@ -421,7 +441,7 @@ class SVGLayer(MapLayer):
         elif element.tag in [SVG_TAG('circle'), SVG_TAG('ellipse'),
                              SVG_TAG('line'), SVG_TAG('path'), SVG_TAG('polyline'),
                              SVG_TAG('polygon'), SVG_TAG('rect')]:
-            geometry = self.__get_geometry(element, properties, transform)
+            geometry = self.__get_geometry(element, properties, transform, definition_id)
             if geometry is None:
                 return None
             # Ignore element if fill is none and no stroke is specified
@@ -454,11 +474,47 @@ class SVGLayer(MapLayer):
             log.warning(f'SVG element {element.tag} "{markup}" not processed...')
         return None
 
-    def __get_geometry(self, element, properties, transform) -> Optional[BaseGeometry]:
-    #==================================================================================
+    def __get_geometry(self, element, properties, transform, definition_id: Optional[str]=None) -> Optional[BaseGeometry]:
+    #===================================================================================================================
     ##
     ## Returns path element as a `shapely` object.
     ##
+    ## The geometry of a ``<use>`` of a definition is that of the definition,
+    ## derived once and then transformed into place.
+    ##
+        if properties.get('node', False):
+            must_close = True
+        elif properties.get('centreline', False):
+            must_close = False
+        else:
+            must_close = properties.get('closed', None)
+        path_geometry = None
+        if definition_id is None:
+            if (path_tokens := self.__path_tokens(element)) is None:
+                return None
+        elif (path_geometry := self.__definitions.get_path_geometry(definition_id, must_close)) is None:
+            path_geometry = PathGeometry(self.__path_tokens(element), must_close)
+            self.__definitions.add_path_geometry(definition_id, must_close, path_geometry)
+        if path_geometry is not None and path_geometry.empty:
+            return None
+        try:
+            wrapped_element = wrap_element(element)
+            T = transform@self.__get_transform(wrapped_element)
+            if path_geometry is None:
+                geometry, bezier_segments = geometry_from_svg_path(path_tokens, T, must_close)
+            else:
+                geometry, bezier_segments = path_geometry.transformed(T)
+            if geometry is not None and properties.get('node', False):
+                # All centeline nodes become circles
+                geometry = circle_from_bounds(geometry.bounds)
+            if self.flatmap.map_kind in [MAP_KIND.ANATOMICAL, MAP_KIND.CENTRELINE]:
+                properties['bezier-segments'] = bezier_segments
+            return geometry
+        except ValueError as err:
+            log.warning(f"{err}: {properties.get('markup')}")
+
+    def __path_tokens(self, element) -> Optional[list[str|float]]:
+    #=============================================================
         path_tokens = []
         if element.tag == SVG_TAG('path'):
             path_tokens = list(parse_svg_path(element.attrib.get('d', '')))
@@ -539,24 +595,7 @@ class SVGLayer(MapLayer):
                            'A', rx, ry, 0, 0, 0, cx+rx, cy,
                            'Z']
 
-        if properties.get('node', False):
-            must_close = True
-        elif properties.get('centreline', False):
-            must_close = False
-        else:
-            must_close = properties.get('closed', None)
-        try:
-            wrapped_element = wrap_element(element)
-            geometry, bezier_segments = geometry_from_svg_path(path_tokens,
-                transform@self.__get_transform(wrapped_element), must_close)
-            if geometry is not None and properties.get('node', False):
-                # All centeline nodes become circles
-                geometry = circle_from_bounds(geometry.bounds)
-            if self.flatmap.map_kind in [MAP_KIND.ANATOMICAL, MAP_KIND.CENTRELINE]:
-                properties['bezier-segments'] = bezier_segments
-            return geometry
-        except ValueError as err:
-            log.warning(f"{err}: {properties.get('markup')}")
+        return path_tokens
 
     def __process_text(self, element, properties, transform: Transform) -> Optional[BaseGeometry]:
     #=============================================================================================
@@ -19,7 +19,7 @@
 #===============================================================================
 
 from datetime import datetime, timezone
-from typing import BinaryIO, TYPE_CHECKING
+from typing import BinaryIO, Optional, TYPE_CHECKING
 
 #===============================================================================
 
@@ -29,7 +29,6 @@ import svgelements
 #===============================================================================
 
 from mapmaker import __version__
-from mapmaker.flatmap.layers import PATHWAYS_TILE_LAYER
 from mapmaker.geometry import Transform
 from mapmaker.properties.markup import parse_markup
 from mapmaker.utils import FilePath
@@ -43,8 +42,42 @@ if TYPE_CHECKING:
 
 #===============================================================================
 
+class SVGExclusions:
+    """
+    Whether SVG elements are excluded from a cleaned SVG, recorded by their
+    markup as the properties of the markup are found when processing features.
+    """
+    def __init__(self):
+        self.__exclusions: dict[str, tuple[bool, bool]] = {}
+
+    @staticmethod
+    def properties_exclusion(properties: dict) -> tuple[bool, bool]:
+    #===============================================================
+        """
+        Whether an element with the given properties is always excluded and
+        whether it is excluded when not all tile layers are kept.
+        """
+        excluded = (any(key in EXCLUDE_SHAPE_TYPES for key in properties)
+                 or properties.get('type') in EXCLUDED_FEATURE_TYPES
+                 or bool(properties.get('exclude', False)))
+        return (excluded, properties.get('tile-layer') in EXCLUDE_TILE_LAYERS)
+
+    def add_markup(self, markup: str, properties: dict):
+    #===================================================
+        if markup.startswith('.'):
+            self.__exclusions[markup] = self.properties_exclusion(properties)
+
+    def excluded(self, markup: str, all_layers: bool) -> Optional[bool]:
+    #===================================================================
+        if (exclusion := self.__exclusions.get(markup)) is None:
+            return None
+        return exclusion[0] or (exclusion[1] and not all_layers)
+
+#===============================================================================
+
 class SVGCleaner(object):
-    def __init__(self, svg_file: FilePath, properties_store: 'PropertiesStore', all_layers: bool=True):
+    def __init__(self, svg_file: FilePath, properties_store: 'PropertiesStore', all_layers: bool=True,
+                 exclusions: Optional[SVGExclusions]=None):
         self.__svg = etree.parse(svg_file.get_fp())
         self.__svg_root = self.__svg.getroot()
 
@@ -60,6 +93,7 @@ class SVGCleaner(object):
 
         self.__properties_store = properties_store
         self.__all_layers = all_layers
+        self.__exclusions = exclusions if exclusions is not None else SVGExclusions()
 
     def add_connectivity_group(self, flatmap: 'FlatMap', transform: Transform):
     #==========================================================================
@@ -69,13 +103,9 @@ class SVGCleaner(object):
             connectivity_group = etree.Element(SVG_TAG('g'))
             inverse_transform = svgelements.Matrix(transform.inverse().svg_matrix)
             self.__svg_root.append(connectivity_group)
-            for layer in flatmap.layers:
-                if layer.exported:
-                    for feature in layer.features:
-                        if (feature.properties.get('tile-layer') == PATHWAYS_TILE_LAYER
-                        and 'Line' in feature.properties['geometry']):
-                            element = svg_element_from_feature(feature, inverse_transform)
-                            connectivity_group.append(element)
+            for feature in flatmap.pathway_line_features:
+                element = svg_element_from_feature(feature, inverse_transform)
+                connectivity_group.append(element)
 
     def clean(self):
     #===============
@@ -103,17 +133,13 @@ class SVGCleaner(object):
     #============================
         markup = svg_markup(element)
         if markup.startswith('.'):
-            properties = parse_markup(markup)
-            properties = self.__properties_store.update_properties(properties)
-            for key, value in properties.items():
-                if not self.__all_layers and key == 'tile-layer' and value in EXCLUDE_TILE_LAYERS:
-                    return True
-                elif key in EXCLUDE_SHAPE_TYPES:
-                    return True
-                elif key == 'type' and value in EXCLUDED_FEATURE_TYPES:
-                    return True
-                elif key == 'exclude' and value:
-                    return True
+            if (excluded := self.__exclusions.excluded(markup, self.__all_layers)) is None:
+                # Markup not seen when processing features, e.g. that of a definition
+                properties = parse_markup(markup)
+                properties = self.__properties_store.update_properties(properties)
+                self.__exclusions.add_markup(markup, properties)
+                excluded = self.__exclusions.excluded(markup, self.__all_layers)
+            return excluded
         return False
 
 #===============================================================================
@@ -19,10 +19,41 @@
 #===============================================================================
 
 import copy
+from typing import Optional
 
 #===============================================================================
 
-from .utils import XLINK_HREF
+import numpy as np
+
+#===============================================================================
+
+from mapmaker.geometry import Transform
+
+from .utils import SVG_TAG, XLINK_HREF, GeometricObject, GeometryNeedsRepair, geometry_from_svg_path, transform_svg_path_geometry
+
+#===============================================================================
+
+# Attributes of a ``<use>`` element that change the shape of the definition it
+# instantiates, by the definition's tag, so that the definition's cached geometry
+# can't be used
+USE_GEOMETRY_ATTRIBUTES = {
+    SVG_TAG('circle'): {'cx', 'cy', 'r'},
+    SVG_TAG('ellipse'): {'cx', 'cy', 'rx', 'ry'},
+    SVG_TAG('image'): {'height', 'rx', 'ry', 'width', 'x', 'y'},
+    SVG_TAG('line'): {'x1', 'x2', 'y1', 'y2'},
+    SVG_TAG('path'): {'d'},
+    SVG_TAG('polygon'): {'points'},
+    SVG_TAG('polyline'): {'points'},
+    SVG_TAG('rect'): {'height', 'rx', 'ry', 'width', 'x', 'y'},
+}
+
+# Used for definitions with any other tag
+ALL_USE_GEOMETRY_ATTRIBUTES = set().union(*USE_GEOMETRY_ATTRIBUTES.values())
+
+# Reflection in the X axis, which is its own inverse
+REFLECT_Y = Transform([[1,  0, 0],
+                       [0, -1, 0],
+                       [0,  0, 1]])
 
 #===============================================================================
 
@@ -60,11 +91,55 @@ class ObjectStore(object):
 
 #===============================================================================
 
+class PathGeometry:
+    """
+    The geometry of a defined path-like element, in the element's own coordinates.
+
+    Geometry is only derived from the path when first needed and then
+    transformed into place for each ``<use>`` of the definition. As ``buffer(0)``
+    depends on the orientation of rings, a reflected copy of the geometry is
+    kept for transforms that reflect. A geometry that is invalid, and so needs
+    repairing in the units of its final coordinates, is instead derived from
+    the path for each use.
+    """
+    def __init__(self, path_tokens: Optional[list[str|float]], must_close: Optional[bool]):
+        self.__path_tokens = path_tokens
+        self.__must_close = must_close
+        self.__local_geometries: dict[bool, GeometricObject|ValueError|GeometryNeedsRepair] = {}
+
+    @property
+    def empty(self) -> bool:
+        return self.__path_tokens is None
+
+    def transformed(self, transform: Transform) -> GeometricObject:
+    #==============================================================
+        reflected = bool(np.linalg.det(transform.matrix[0:2, 0:2]) < 0)
+        local_transform = REFLECT_Y if reflected else Transform.Identity()
+        if (local_geometry := self.__local_geometries.get(reflected)) is None:
+            try:
+                local_geometry = geometry_from_svg_path(self.__path_tokens, local_transform,     # type: ignore
+                                                        self.__must_close, repair=False)
+            except (GeometryNeedsRepair, ValueError) as err:
+                local_geometry = err
+            self.__local_geometries[reflected] = local_geometry
+        if isinstance(local_geometry, GeometryNeedsRepair):
+            return geometry_from_svg_path(self.__path_tokens, transform, self.__must_close)     # type: ignore
+        elif isinstance(local_geometry, ValueError):
+            raise local_geometry
+        return transform_svg_path_geometry(*local_geometry, transform@local_transform)
+
+#===============================================================================
+
 class DefinitionStore(ObjectStore):
+    def __init__(self):
+        super().__init__()
+        self.__path_geometries: dict[str, dict[Optional[bool], PathGeometry]] = {}
 
     def add_definition(self, element):
     #=================================
-        super().add(element.attrib.get('id'), element)
+        id = element.attrib.get('id')
+        super().add(id, element)
+        self.__path_geometries.pop(id, None)
 
     def get_by_url(self, url_id):
     #============================
@@ -86,4 +161,25 @@ class DefinitionStore(ObjectStore):
                 return result
         return None
 
+    def use_id(self, element) -> Optional[str]:
+    #==========================================
+        """
+        The id of the definition a ``<use>`` element refers to, provided the
+        element doesn't change the definition's shape.
+        """
+        id = element.attrib.get('href', element.attrib.get(XLINK_HREF))
+        if (id is not None and id.startswith('#')
+        and (definition := self.get(id[1:])) is not None
+        and USE_GEOMETRY_ATTRIBUTES.get(definition.tag, ALL_USE_GEOMETRY_ATTRIBUTES).isdisjoint(element.attrib)):
+            return id[1:]
+        return None
+
+    def get_path_geometry(self, id: str, must_close: Optional[bool]) -> Optional[PathGeometry]:
+    #==========================================================================================
+        return self.__path_geometries.get(id, {}).get(must_close)
+
+    def add_path_geometry(self, id: str, must_close: Optional[bool], path_geometry: PathGeometry):
+    #=============================================================================================
+        self.__path_geometries.setdefault(id, {})[must_close] = path_geometry
+
 #===============================================================================
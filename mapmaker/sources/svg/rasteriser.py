@@ -305,7 +305,13 @@ class CanvasGroup(CanvasDrawingObject):
 class SVGTiler(object):
     def __init__(self, raster_layer: 'RasterLayer', tile_set: 'TileSet'):
         self.__bbox = shapely.geometry.box(*extent_to_bounds(raster_layer.extent))
-        self.__svg = etree.fromstring(raster_layer.source_data, parser=etree.XMLParser(huge_tree=True))
+        source_data = raster_layer.source_data
+        if isinstance(source_data, bytes):
+            self.__svg = etree.fromstring(source_data, parser=etree.XMLParser(huge_tree=True))
+        else:
+            # Parse SVG that is in a file, without reading it all into memory
+            source_data.seek(0)
+            self.__svg = etree.parse(source_data, parser=etree.XMLParser(huge_tree=True)).getroot()
         self.__source_path: Optional[FilePath] = raster_layer.source_path
         if 'viewBox' in self.__svg.attrib:
             viewbox = [float(x) for x in self.__svg.attrib.get('viewBox').split()]
@@ -18,6 +18,12 @@
 #
 #===============================================================================
 
+from collections.abc import Iterator, Mapping, MutableMapping
+from functools import lru_cache
+from typing import Any, Optional
+
+#===============================================================================
+
 import cssselect2
 import tinycss2
 
@@ -29,22 +35,123 @@ from mapmaker.utils import log
 
 UNIMPLEMENTED_STYLES = ['filter']
 
+# Style lookups search at most this many inherited layers before they are merged
+MAX_STYLE_LAYERS = 8
+
 #===============================================================================
 
-class ElementStyleDict(dict):
-    def __init__(self, element, style_dict={}):
-        super().__init__(style_dict)   # Copies dict
-        attributes = dict(element.attrib)
-        if 'style' in attributes:
-            style_attribute = attributes.pop('style')
-            local_style = {}
-            for declaration in tinycss2.parse_declaration_list(
-                style_attribute,
-                skip_comments=True, skip_whitespace=True):
-                local_style[declaration.lower_name] = ' '.join(
-                    [t.serialize() for t in declaration.value])
-            super().update(local_style)
-        super().update(attributes)
+@lru_cache(maxsize=None)
+def parse_style_attribute(style_attribute: str) -> tuple[tuple[str, str], ...]:
+#==============================================================================
+    return tuple((declaration.lower_name, ' '.join([t.serialize() for t in declaration.value]))
+                    for declaration in tinycss2.parse_declaration_list(
+                        style_attribute,
+                        skip_comments=True, skip_whitespace=True))
+
+#===============================================================================
+
+# Marks a style that has been removed from an element's inherited style
+REMOVED_STYLE = object()
+
+class ElementStyleDict(MutableMapping):
+    """
+    An element's style, on top of the style it inherits.
+
+    Inherited style is shared, as a chain of layers that are never changed
+    once shared, instead of being copied for every element. A layer is only
+    copied if its owner changes it after it has been shared.
+    """
+    def __init__(self, element=None, style_dict: Optional[Mapping[str, Any]]=None,
+                 matched_style: Optional[dict[str, str]]=None):
+        if isinstance(style_dict, ElementStyleDict):
+            self.__layers = style_dict.__shared_layers()
+        elif style_dict:
+            self.__layers = (dict(style_dict),)
+        else:
+            self.__layers = ()
+        self.__local: dict[str, Any] = dict(matched_style) if matched_style is not None else {}
+        self.__local_shared = False
+        if element is not None:
+            attributes = element.attrib
+            if (style_attribute := attributes.get('style')) is not None:
+                self.__local.update(parse_style_attribute(style_attribute))
+            for key, value in attributes.items():
+                if key != 'style':
+                    self.__local[key] = value
+        if len(self.__layers) > MAX_STYLE_LAYERS:
+            self.__merge_layers()
+
+    def __getitem__(self, key):
+        if (value := self.__local.get(key, REMOVED_STYLE)) is REMOVED_STYLE:
+            if key in self.__local:
+                raise KeyError(key)
+            for layer in reversed(self.__layers):
+                if (value := layer.get(key, REMOVED_STYLE)) is not REMOVED_STYLE:
+                    break
+                elif key in layer:
+                    raise KeyError(key)
+            else:
+                raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.__own_local()[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.__own_local()[key] = REMOVED_STYLE
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__merged())
+
+    def __len__(self) -> int:
+        return len(self.__merged())
+
+    def copy(self) -> 'ElementStyleDict':
+    #====================================
+        return ElementStyleDict(style_dict=self)
+
+    def __merged(self) -> dict[str, Any]:
+    #====================================
+        merged = {}
+        for layer in self.__layers + (self.__local,):
+            merged.update(layer)
+        return {key: value for key, value in merged.items() if value is not REMOVED_STYLE}
+
+    def __merge_layers(self):
+    #========================
+        merged = {}
+        for layer in self.__layers:
+            merged.update(layer)
+        self.__layers = ({key: value for key, value in merged.items() if value is not REMOVED_STYLE},)
+
+    def __own_local(self) -> dict[str, Any]:
+    #=======================================
+        if self.__local_shared:
+            self.__local = dict(self.__local)
+            self.__local_shared = False
+        return self.__local
+
+    def __shared_layers(self) -> tuple[dict[str, Any], ...]:
+    #=======================================================
+        if len(self.__local) == 0:
+            return self.__layers
+        self.__local_shared = True
+        return self.__layers + (self.__local,)
+
+#===============================================================================
+
+# Selectors made from only these tokens depend on just the tag, id and class
+# of an element and of its ancestors
+SIMPLE_SELECTOR_TOKENS = {'ident', 'hash', 'whitespace'}
+SIMPLE_SELECTOR_LITERALS = {'.', '>', '*', ','}
+
+def simple_selector(prelude) -> bool:
+#====================================
+    return all(token.type in SIMPLE_SELECTOR_TOKENS
+            or token.type == 'literal' and token.value in SIMPLE_SELECTOR_LITERALS
+                for token in prelude)
 
 #===============================================================================
 
@@ -55,7 +162,13 @@ class StyleMatcher(cssselect2.Matcher):
         rules = tinycss2.parse_stylesheet(style_element.text
                     if style_element is not None else '',
                     skip_comments=True, skip_whitespace=True)
+        # Matched styles are cached by an element's ancestor chain when all
+        # rules have simple selectors
+        self.__cacheable = True
+        self.__matched_styles: dict[tuple, tuple[tuple[str, Optional[str], Optional[str]], ...]] = {}
         for rule in rules:
+            if rule.type != 'qualified-rule' or not simple_selector(rule.prelude):
+                self.__cacheable = False
             selectors = cssselect2.compile_selector_list(rule.prelude)
             declarations = [obj for obj in tinycss2.parse_declaration_list(
                                                rule.content,
@@ -75,15 +188,36 @@ class StyleMatcher(cssselect2.Matcher):
                     styling[declaration.lower_name] = declaration.value
         return styling
 
+    def __matched_style(self, wrapped_element) -> tuple[tuple[str, Optional[str], Optional[str]], ...]:
+    #==================================================================================================
+        # (name, value, warning) for each matched declaration
+        if self.__cacheable:
+            key = []
+            wrapper = wrapped_element
+            while wrapper is not None:
+                element = wrapper.etree_element
+                key.append((element.tag, element.get('id'), element.get('class')))
+                wrapper = wrapper.parent
+            key = tuple(key)
+            if (matched_style := self.__matched_styles.get(key)) is not None:
+                return matched_style
+        matched_style = tuple((name, None, "'{}: {}' not implemented".format(name, value))
+                                if name in UNIMPLEMENTED_STYLES else
+                              (name, ' '.join([t.serialize() for t in value]), None)
+                                for name, value in self.__match(wrapped_element).items())
+        if self.__cacheable:
+            self.__matched_styles[key] = matched_style
+        return matched_style
+
     def element_style(self, wrapped_element, parent_style=None):
     #===========================================================
-        element_style = parent_style.copy() if parent_style is not None else {}
-        for key, value in self.__match(wrapped_element).items():
-            if key in UNIMPLEMENTED_STYLES:
-                log.warning("'{}: {}' not implemented".format(key, value))
+        element_style = {}
+        for key, value, warning in self.__matched_style(wrapped_element):
+            if warning is not None:
+                log.warning(warning)
             else:
-                element_style[key] = ' '.join([t.serialize() for t in value])
-        return ElementStyleDict(wrapped_element.etree_element, element_style)
+                element_style[key] = value
+        return ElementStyleDict(wrapped_element.etree_element, parent_style, element_style)
 
 #===============================================================================
 
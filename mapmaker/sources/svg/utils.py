@@ -234,7 +234,14 @@ def svg_element_from_feature(feature: Feature, inverse_transform: svgelements.Ma
 
 #===============================================================================
 
-def __geometry_from_coordinates(coordinates: list[Coordinate], closed: bool, must_close: Optional[bool]) -> Optional[BaseGeometry]:
+class GeometryNeedsRepair(Exception):
+    """
+    Raised instead of repairing an invalid geometry, as repairs depend on the
+    units of the geometry's coordinates.
+    """
+
+def __geometry_from_coordinates(coordinates: list[Coordinate], closed: bool, must_close: Optional[bool],
+                                repair: bool=True) -> Optional[BaseGeometry]:
     if must_close == False and closed:
         raise ValueError("Shape can't have closed geometry")
     elif must_close == True and not closed:
@@ -254,6 +261,8 @@ def __geometry_from_coordinates(coordinates: list[Coordinate], closed: bool, mus
         geometry = None
 
     if geometry is not None and not geometry.is_valid:
+        if not repair:
+            raise GeometryNeedsRepair()
         if 'Polygon' in geometry.geom_type:
             # Try smoothing out boundary irregularities
             geometry = geometry.buffer(20)
@@ -270,7 +279,7 @@ type GeometricObject = tuple[Optional[BaseGeometry], list[BezierSegment]]
 #===============================================================================
 
 def geometry_from_svg_path(path_tokens: list[str|float], transform: Transform,
-                           must_close: Optional[bool]=None) -> GeometricObject:
+                           must_close: Optional[bool]=None, repair: bool=True) -> GeometricObject:
 
     geometries: list[BaseGeometry] = []
 
@@ -372,7 +381,7 @@ def geometry_from_svg_path(path_tokens: list[str|float], transform: Transform,
 
         elif cmd in ['m', 'M']:
             if len(coordinates):
-                if (geometry := __geometry_from_coordinates(coordinates, closed, must_close)) is not None:
+                if (geometry := __geometry_from_coordinates(coordinates, closed, must_close, repair)) is not None:
                     geometries.append(geometry)
                 coordinates: list[Coordinate] = []
                 closed = False
@@ -430,7 +439,7 @@ def geometry_from_svg_path(path_tokens: list[str|float], transform: Transform,
     elif must_close == True and not closed:
         raise ValueError("Shape must have closed geometry")
 
-    if (geometry := __geometry_from_coordinates(coordinates, closed, must_close)) is not None:
+    if (geometry := __geometry_from_coordinates(coordinates, closed, must_close, repair)) is not None:
         geometries.append(geometry)
 
     geometry = (None if len(geometries) == 0
@@ -439,5 +448,24 @@ def geometry_from_svg_path(path_tokens: list[str|float], transform: Transform,
 
     return (geometry, bezier_segments)
 
+def transform_svg_path_geometry(geometry: Optional[BaseGeometry], bezier_segments: list[BezierSegment],
+                                transform: Transform) -> GeometricObject:
+#=======================================================================================================
+    """
+    Apply an affine transform to the result of ``geometry_from_svg_path()``.
+
+    Sampling a Bezier curve commutes with affine transforms, so this gives the
+    same geometry, to within rounding, as passing ``transform`` to
+    ``geometry_from_svg_path()``, provided ``transform`` doesn't reflect (``buffer(0)``
+    depends on the orientation of rings) and the geometry was found without
+    ``repair`` (an invalid polygon is repaired with a buffer in the units of its
+    coordinates).
+    """
+    if geometry is not None:
+        geometry = transform.transform_geometry(geometry)
+    return (geometry, [type(segment)(*[BezierPoint(*transform.transform_point((point.x, point.y)))
+                                        for point in segment.points])
+                        for segment in bezier_segments])
+
 #===============================================================================
 
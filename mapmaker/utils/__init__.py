@@ -31,12 +31,19 @@ import urllib.request
 
 # Export from module
 
+from .lazy import lazy_import
 from .logging import ProgressBar, configure_logging, log
+from .profile import BuildProfile, profile_count, profile_span
 from .property_mixin import PropertyMixin
 from .treelist import TreeList
 
 #===============================================================================
 
+# The default number of processes or threads to use for parallel work
+CPU_COUNT = 8 if (cpu_count := os.cpu_count()) is None else cpu_count
+
+#===============================================================================
+
 """
 For generating ``lxml`` element tags
 """
@@ -0,0 +1,56 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+import importlib.util
+import sys
+from types import ModuleType
+
+#===============================================================================
+
+def lazy_import(name: str) -> ModuleType:
+#========================================
+    """
+    Import a module when one of its attributes is first used, instead of when
+    the importing module is loaded::
+
+        pyomo = lazy_import('pyomo.environ')
+
+    The parent packages of a submodule are imported immediately. Extension
+    modules (e.g. ``skia``) are always fully imported, as initialising them
+    is what loads them.
+    """
+    if (module := sys.modules.get(name)) is not None:
+        return module
+    if (spec := importlib.util.find_spec(name)) is None or spec.loader is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    # Finding a submodule imports its parent, which may import the submodule
+    if (module := sys.modules.get(name)) is not None:
+        return module
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    (parent, _, child) = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+#===============================================================================
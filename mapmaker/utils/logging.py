@@ -156,6 +156,11 @@ class ProgressBar(object):
         else:
             self.__progress_bar = None
 
+    def set_postfix(self, postfix: str):
+    #===================================
+        if self.__progress_bar is not None:
+            self.__progress_bar.set_postfix_str(postfix, refresh=False)
+
     def update(self, *args):
     #=======================
         if self.__progress_bar is not None:
@@ -0,0 +1,223 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Lightweight profiling of the stages of making a map.
+
+Stages are timed with nested spans, each recording wall and CPU time (including
+that of finished child processes such as ``tippecanoe``), peak resident memory,
+and counts of things processed in the span. Python memory allocation is also
+recorded when ``tracemalloc`` is tracing.
+
+The profile of the current build is held in ``settings['BUILD_PROFILE']``::
+
+    with profile_span('routing'):
+        ...
+        profile_count('paths', len(paths))
+"""
+
+#===============================================================================
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import json
+import resource
+import time
+import tracemalloc
+from typing import Any, Iterator, Optional
+
+#===============================================================================
+
+from mapmaker.settings import settings
+
+from .logging import log
+
+#===============================================================================
+
+def cpu_seconds() -> float:
+#==========================
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (self_usage.ru_utime + self_usage.ru_stime
+          + children_usage.ru_utime + children_usage.ru_stime)
+
+def peak_rss_mb() -> float:
+#==========================
+    # ``ru_maxrss`` is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024
+
+#===============================================================================
+
+class ProfileSpan:
+    def __init__(self, name: str, parent: Optional['ProfileSpan']=None):
+        self.__name = name
+        self.__parent = parent
+        self.__children: list[ProfileSpan] = []
+        self.__counters: defaultdict[str, int] = defaultdict(int)
+        self.__wall = 0.0
+        self.__cpu = 0.0
+        self.__peak_rss = 0.0
+        self.__traced: Optional[tuple[int, int]] = None
+        self.__traced_peak = 0
+        self.__finished = False
+        if parent is not None:
+            parent.__children.append(self)
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return self.__counters
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def path(self) -> str:
+        return self.__name if self.__parent is None else f'{self.__parent.path}/{self.__name}'
+
+    def count(self, name: str, count: int=1):
+    #========================================
+        self.__counters[name] += count
+
+    def start(self):
+    #===============
+        if tracemalloc.is_tracing():
+            # Keep the parent's peak allocation before we reset the peak for ourselves
+            (current, peak) = tracemalloc.get_traced_memory()
+            if self.__parent is not None:
+                self.__parent.__traced_peak = max(self.__parent.__traced_peak, peak)
+            tracemalloc.reset_peak()
+            self.__traced = (current, current)
+        self.__start_cpu = cpu_seconds()
+        self.__start_wall = time.perf_counter()
+
+    def stop(self):
+    #==============
+        self.__wall = time.perf_counter() - self.__start_wall
+        self.__cpu = cpu_seconds() - self.__start_cpu
+        self.__peak_rss = peak_rss_mb()
+        if self.__traced is not None and tracemalloc.is_tracing():
+            (current, peak) = tracemalloc.get_traced_memory()
+            self.__traced_peak = max(self.__traced_peak, peak)
+            self.__traced = (self.__traced[0], current)
+            if self.__parent is not None:
+                self.__parent.__traced_peak = max(self.__parent.__traced_peak, self.__traced_peak)
+        if self.__parent is not None:
+            # Counts include those of child spans
+            for name, count in self.__counters.items():
+                self.__parent.__counters[name] += count
+        self.__finished = True
+
+    def as_dict(self, children: bool=True) -> dict[str, Any]:
+    #========================================================
+        result: dict[str, Any] = {
+            'name': self.__name,
+            'wall-seconds': round(self.__wall, 3),
+            'cpu-seconds': round(self.__cpu, 3),
+            'peak-rss-mb': round(self.__peak_rss, 1),
+        }
+        if self.__traced is not None:
+            result['traced-delta-mb'] = round((self.__traced[1] - self.__traced[0])/1048576, 3)
+            result['traced-peak-mb'] = round((self.__traced_peak - self.__traced[0])/1048576, 3)
+        if len(self.__counters):
+            result['counters'] = dict(self.__counters)
+        if children and len(self.__children):
+            result['spans'] = [child.as_dict() for child in self.__children]
+        return result
+
+    def finished_children(self) -> list['ProfileSpan']:
+    #==================================================
+        return [child for child in self.__children if child.__finished]
+
+#===============================================================================
+
+class BuildProfile:
+    def __init__(self):
+        self.__root: Optional[ProfileSpan] = None
+        self.__stack: list[ProfileSpan] = []
+
+    def count(self, name: str, count: int=1):
+    #========================================
+        if len(self.__stack):
+            self.__stack[-1].count(name, count)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[ProfileSpan]:
+    #==================================================
+        if len(self.__stack):
+            span = ProfileSpan(name, self.__stack[-1])
+        else:
+            span = ProfileSpan(name)
+            self.__root = span
+        self.__stack.append(span)
+        span.start()
+        try:
+            yield span
+        finally:
+            span.stop()
+            self.__stack.pop()
+            log.debug('Profiled span', span=span.path, **{k.replace('-', '_'): v
+                                                            for k, v in span.as_dict(False).items()
+                                                                if k != 'name'})
+
+    def as_dict(self) -> dict[str, Any]:
+    #===================================
+        return self.__root.as_dict() if self.__root is not None else {}
+
+    def summary(self) -> dict[str, Any]:
+    #===================================
+        """
+        The profile of the build's finished top-level stages, without nested
+        spans, and the build's total once it has finished.
+        """
+        summary: dict[str, Any] = {}
+        if self.__root is not None:
+            if self.__root.finished:
+                summary['total'] = self.__root.as_dict(False)
+                summary['total'].pop('name')
+            summary['stages'] = {}
+            for span in self.__root.finished_children():
+                summary['stages'][span.name] = span.as_dict(False)
+                summary['stages'][span.name].pop('name')
+        return summary
+
+    def save(self, filename: str):
+    #=============================
+        with open(filename, 'w') as fp:
+            json.dump(self.as_dict(), fp, indent=4)
+
+#===============================================================================
+
+def profile_span(name: str):
+#===========================
+    if (profile := settings.get('BUILD_PROFILE')) is None:
+        return nullcontext()
+    return profile.span(name)
+
+def profile_count(name: str, count: int=1):
+#==========================================
+    if (profile := settings.get('BUILD_PROFILE')) is not None:
+        profile.count(name, count)
+
+#===============================================================================
@@ -0,0 +1,63 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Repeatable benchmarks of map making, using the fixture maps under ``tests/``.
+
+Run from the top of the repository with::
+
+    python -m tools.benchmark --output results.json
+    python -m tools.benchmark --baseline baseline.json --threshold 10
+
+Each fixture is built in its own ``mapmaker`` process, without Git, SCKAN or
+publishing, and the stages of the build are taken from the map's
+``build-profile.json``. Micro-benchmarks time hot functions, either over the
+SVG path data of the fixtures or against the flatmap of an in-process build.
+The startup of the ``mapmaker`` command is checked against a time budget.
+"""
+
+#===============================================================================
+
+from pathlib import Path
+
+#===============================================================================
+
+TESTS_DIRECTORY = Path(__file__).parent.parent.parent / 'tests'
+
+# Fixture manifests that can be built from the repository alone (the
+# manifests of ``tests/sources`` and ``tests/vagus-base`` reference files
+# outside of it)
+FIXTURES = {
+    'keast': 'keast/bladder-manifest.json',
+    'path-test': 'path-test/manifest.json',
+    'svg-details': 'svg-details/manifest.json',
+    'vagus': 'vagus/manifest.json',
+}
+
+#===============================================================================
+
+def fixture_manifest(fixture: str, tests_directory: Path=TESTS_DIRECTORY) -> Path:
+#=================================================================================
+    if fixture in FIXTURES:
+        return tests_directory / FIXTURES[fixture]
+    # Allow any other manifest to be benchmarked
+    return Path(fixture)
+
+#===============================================================================
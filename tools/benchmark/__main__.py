@@ -0,0 +1,152 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import sys
+from typing import Any
+
+#===============================================================================
+
+from . import FIXTURES, TESTS_DIRECTORY, fixture_manifest
+from .compare import Thresholds, compare_results
+from .startup import STARTUP_BUDGET
+
+#===============================================================================
+
+def print_results(results: dict[str, Any]):
+#==========================================
+    for (fixture, build) in results.get('builds', {}).items():
+        print(f'{fixture}: {build["process-seconds"]:8.3f} s in process')
+        for (span, values) in build['spans'].items():
+            print(f'  {span:<40} {values.get("wall-seconds", 0.0):8.3f} s wall, '
+                  f'{values.get("cpu-seconds", 0.0):8.3f} s cpu, '
+                  f'{values.get("peak-rss-mb", 0.0):8.1f} MB peak')
+    for (name, timing) in results.get('micro', {}).items():
+        print(f'{name:>24}: {1000*timing["seconds"]:10.3f} ms per pass, '
+              f'{timing["us-per-call"]:10.3f} us per call')
+    if (startup := results.get('startup')) is not None:
+        print(f'Startup: {startup["version-seconds"]:.3f} s for --version, '
+              f'{startup["help-seconds"]:.3f} s for --help, '
+              f'{startup["python-seconds"]:.3f} s for Python itself')
+
+#===============================================================================
+
+def main():
+#==========
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m tools.benchmark',
+        description='Benchmark making the fixture maps in `tests/` and the functions hot when making them.')
+    parser.add_argument('--fixture', dest='fixtures', metavar='FIXTURE', action='append',
+                        help=f'Fixture to build, either one of {", ".join(FIXTURES)} or the path '
+                              'of a manifest. May be repeated (default: all fixtures)')
+    parser.add_argument('--no-builds', dest='builds', action='store_false',
+                        help="Don't benchmark building fixtures")
+    parser.add_argument('--no-micro', dest='micro', action='store_false',
+                        help="Don't run micro-benchmarks")
+    parser.add_argument('--no-startup', dest='startup', action='store_false',
+                        help="Don't benchmark the startup of the `mapmaker` command")
+    parser.add_argument('--build-repeat', dest='buildRepeat', metavar='N', type=int, default=1,
+                        help='Number of times to build each fixture, keeping the fastest (default: 1)')
+    parser.add_argument('--memory', action='store_true',
+                        help='Trace Python memory allocation when building fixtures')
+    parser.add_argument('--repeat', metavar='N', type=int, default=5,
+                        help='Number of passes of each micro-benchmark, keeping the fastest (default: 5)')
+    parser.add_argument('--micro-fixture', dest='microFixture', metavar='FIXTURE', default='keast',
+                        help="Fixture whose flatmap is used for tiling, GeoJSON and feature search "
+                             "micro-benchmarks, or `none` (default: keast)")
+    parser.add_argument('--tile-zoom', dest='tileZoom', metavar='N', type=int, default=6,
+                        help='Zoom level of tiles for the `SVGTiler` micro-benchmark (default: 6)')
+    parser.add_argument('--startup-budget', dest='startupBudget', metavar='SECONDS', type=float,
+                        default=STARTUP_BUDGET,
+                        help=f'Exit with an error if `mapmaker --help` or `--version` take longer than this, '
+                             f'or import heavy dependencies (default: {STARTUP_BUDGET})')
+    parser.add_argument('--tests', default=str(TESTS_DIRECTORY),
+                        help='Directory containing the test fixtures')
+    parser.add_argument('--output', metavar='RESULTS_FILE',
+                        help='Save results as JSON, for instance to use as a baseline')
+    parser.add_argument('--baseline', metavar='BASELINE_FILE',
+                        help='Compare results against a baseline and exit with an error if there are regressions')
+    parser.add_argument('--threshold', metavar='PERCENT', type=float, default=Thresholds.time_percent,
+                        help=f'Allowed increase in timings (default: {Thresholds.time_percent}%%)')
+    parser.add_argument('--memory-threshold', dest='memoryThreshold', metavar='PERCENT', type=float,
+                        default=Thresholds.memory_percent,
+                        help=f'Allowed increase in memory (default: {Thresholds.memory_percent}%%)')
+    parser.add_argument('--min-seconds', dest='minSeconds', metavar='SECONDS', type=float,
+                        default=Thresholds.min_seconds,
+                        help=f'Ignore timings shorter than this (default: {Thresholds.min_seconds})')
+    args = parser.parse_args()
+
+    tests_directory = Path(args.tests)
+    results: dict[str, Any] = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    if args.startup:
+        from .startup import benchmark as startup_benchmark
+        results['startup'] = startup_benchmark(args.repeat)
+    if args.builds:
+        from .builds import benchmark as build_benchmark
+        fixtures = args.fixtures if args.fixtures else list(FIXTURES)
+        results['builds'] = build_benchmark({fixture: fixture_manifest(fixture, tests_directory)
+                                                for fixture in fixtures},
+                                            args.buildRepeat, args.memory)
+    if args.micro:
+        from .micro import benchmark as micro_benchmark
+        manifest = (fixture_manifest(args.microFixture, tests_directory)
+                        if args.microFixture != 'none' else None)
+        results['micro'] = micro_benchmark(tests_directory, manifest, args.repeat, args.tileZoom)
+
+    print_results(results)
+    if args.output is not None:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=4)
+
+    failed = False
+    if args.startup:
+        from .startup import check_budget
+        for error in check_budget(results['startup'], args.startupBudget):
+            print(error)
+            failed = True
+
+    if args.baseline is not None:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        (regressions, improvements) = compare_results(baseline, results,
+                                                      Thresholds(args.threshold, args.memoryThreshold, args.minSeconds))
+        for change in improvements:
+            print(f'Improved: {change.metric} {change.baseline} -> {change.current} ({change.percent:+.1f}%)')
+        for change in regressions:
+            print(f'Regressed: {change.metric} {change.baseline} -> {change.current} ({change.percent:+.1f}%)')
+        if len(regressions):
+            failed = True
+    if failed:
+        sys.exit(1)
+
+#===============================================================================
+
+if __name__ == '__main__':
+    main()
+
+#===============================================================================
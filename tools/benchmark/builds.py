@@ -0,0 +1,96 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Benchmark of building fixture maps, each in a separate ``mapmaker`` process
+so that builds don't share caches or global settings.
+"""
+
+#===============================================================================
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Optional
+
+#===============================================================================
+
+# Span metrics that are kept in results
+SPAN_METRICS = ['wall-seconds', 'cpu-seconds', 'peak-rss-mb', 'traced-peak-mb']
+
+BUILD_PROFILE = 'build-profile.json'    # As saved by ``mapmaker.maker``
+
+#===============================================================================
+
+def flatten_spans(span: dict[str, Any], parent: str='') -> dict[str, dict[str, Any]]:
+#====================================================================================
+    path = f'{parent}/{span["name"]}' if parent else span['name']
+    spans = {path: {metric: span[metric] for metric in SPAN_METRICS if metric in span}}
+    if 'counters' in span:
+        spans[path]['counters'] = span['counters']
+    for child in span.get('spans', []):
+        spans.update(flatten_spans(child, path))
+    return spans
+
+def build_fixture(manifest: Path, memory: bool=False) -> dict[str, Any]:
+#=======================================================================
+    with tempfile.TemporaryDirectory() as output_dir:
+        log_file = Path(output_dir) / 'mapmaker.log'
+        command = [sys.executable, '-m', 'mapmaker',
+                   '--source', str(manifest), '--output', output_dir,
+                   '--force', '--ignore-git', '--ignore-sckan',
+                   '--silent', '--log', str(log_file)]
+        if memory:
+            command.append('--profile-memory')
+        start = time.perf_counter()
+        process = subprocess.run(command, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if process.returncode != 0 or (profile_file := next(Path(output_dir).rglob(BUILD_PROFILE), None)) is None:
+            error = log_file.read_text() if log_file.exists() else process.stderr
+            raise RuntimeError(f'Cannot build {manifest}:\n{error[-2000:]}')
+        with open(profile_file) as fp:
+            profile = json.load(fp)
+    return {
+        'process-seconds': round(wall, 3),
+        'spans': flatten_spans(profile)
+    }
+
+#===============================================================================
+
+def benchmark(manifests: dict[str, Path], repeat: int, memory: bool=False) -> dict[str, dict[str, Any]]:
+#=======================================================================================================
+    """
+    Build each manifest ``repeat`` times, keeping the fastest of the builds.
+    """
+    results = {}
+    for (name, manifest) in manifests.items():
+        fastest: Optional[dict[str, Any]] = None
+        for _ in range(repeat):
+            result = build_fixture(manifest, memory)
+            if fastest is None or result['process-seconds'] < fastest['process-seconds']:
+                fastest = result
+        if fastest is not None:
+            results[name] = fastest
+    return results
+
+#===============================================================================
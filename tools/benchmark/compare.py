@@ -0,0 +1,97 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Comparison of benchmark results against a stored baseline.
+"""
+
+#===============================================================================
+
+from dataclasses import dataclass
+from typing import Any
+
+#===============================================================================
+
+@dataclass
+class Thresholds:
+    time_percent: float = 10.0      # Allowed slowdown
+    memory_percent: float = 10.0    # Allowed growth in memory
+    min_seconds: float = 0.005      # Timings shorter than this are noise
+
+@dataclass
+class Change:
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def percent(self) -> float:
+        return 100.0*(self.current - self.baseline)/self.baseline
+
+#===============================================================================
+
+def result_metrics(results: dict[str, Any]) -> dict[str, float]:
+#===============================================================
+    """
+    The comparable metrics of a set of results, keyed by a path name.
+    """
+    metrics = {}
+    for (fixture, build) in results.get('builds', {}).items():
+        metrics[f'builds/{fixture}/process-seconds'] = build['process-seconds']
+        for (span, values) in build['spans'].items():
+            for (name, value) in values.items():
+                if isinstance(value, (int, float)):
+                    metrics[f'builds/{fixture}/{span}/{name}'] = value
+    for (name, timing) in results.get('micro', {}).items():
+        metrics[f'micro/{name}/seconds'] = timing['seconds']
+    for (name, value) in results.get('startup', {}).items():
+        # Python's own startup is only for context
+        if isinstance(value, (int, float)) and name != 'python-seconds':
+            metrics[f'startup/{name}'] = value
+    return metrics
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any],
+                    thresholds: Thresholds) -> tuple[list[Change], list[Change]]:
+#==================================================================================
+    """
+    Find the metrics that have regressed or improved beyond their threshold.
+
+    Metrics missing from either set of results are not compared.
+    """
+    regressions = []
+    improvements = []
+    baseline_metrics = result_metrics(baseline)
+    for (metric, value) in result_metrics(current).items():
+        if (base_value := baseline_metrics.get(metric)) is None or base_value <= 0:
+            continue
+        if metric.endswith('-mb'):
+            threshold = thresholds.memory_percent
+        elif max(value, base_value) < thresholds.min_seconds:
+            continue
+        else:
+            threshold = thresholds.time_percent
+        change = Change(metric, base_value, value)
+        if change.percent > threshold:
+            regressions.append(change)
+        elif change.percent < -threshold:
+            improvements.append(change)
+    return (regressions, improvements)
+
+#===============================================================================
@@ -0,0 +1,190 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Micro-benchmarks of hot functions.
+
+SVG path functions are timed over the path data of the SVG sources under
+``tests/``. Tiling, GeoJSON output and feature search are timed against the
+flatmap of a fixture that is first built in-process.
+"""
+
+#===============================================================================
+
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Callable
+
+#===============================================================================
+
+import lxml.etree as etree
+
+#===============================================================================
+
+from mapmaker import MapMaker
+from mapmaker.flatmap import FlatMap
+from mapmaker.geometry import FeatureSearch, Transform
+from mapmaker.output.geojson import GeoJSONOutput
+from mapmaker.output.tilemaker import TileSet
+from mapmaker.sources import WORLD_METRES_PER_PIXEL
+from mapmaker.sources.svg.rasteriser import SVGTiler
+from mapmaker.sources.svg.utils import SVG_TAG, geometry_from_svg_path, parse_svg_path
+
+#===============================================================================
+
+SVG_TO_WORLD = Transform([[WORLD_METRES_PER_PIXEL,                       0, 0],
+                          [                     0, -WORLD_METRES_PER_PIXEL, 0],
+                          [                     0,                       0, 1]])
+
+#===============================================================================
+
+def timed(function: Callable[[], int], repeat: int) -> dict[str, Any]:
+#=====================================================================
+    """
+    Time the best of ``repeat`` passes of a function that returns the number
+    of calls it has made of the function being benchmarked.
+    """
+    best = None
+    calls = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calls = function()
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    best = best if best is not None else 0.0
+    return {
+        'seconds': round(best, 6),
+        'calls': calls,
+        'us-per-call': round(1000000*best/max(calls, 1), 3)
+    }
+
+#===============================================================================
+
+def svg_path_data(tests_directory: Path) -> list[str]:
+#=====================================================
+    path_data = []
+    for svg_file in sorted(tests_directory.rglob('*.svg')):
+        for element in etree.parse(str(svg_file)).iter(SVG_TAG('path')):
+            if (d := element.attrib.get('d', '').strip()):
+                path_data.append(d)
+    return path_data
+
+def svg_path_benchmarks(path_data: list[str], repeat: int) -> dict[str, dict[str, Any]]:
+#=======================================================================================
+    def parse_paths():
+        for d in path_data:
+            list(parse_svg_path(d))
+        return len(path_data)
+
+    path_tokens = [list(parse_svg_path(d)) for d in path_data]
+    def path_geometries():
+        for tokens in path_tokens:
+            try:
+                geometry_from_svg_path(tokens, SVG_TO_WORLD)
+            except ValueError:
+                pass
+        return len(path_tokens)
+
+    return {
+        'parse_svg_path': timed(parse_paths, repeat),
+        'geometry_from_svg_path': timed(path_geometries, repeat),
+    }
+
+#===============================================================================
+
+def make_flatmap(manifest: Path, output_dir: str) -> FlatMap:
+#============================================================
+    maker = MapMaker({
+        'source': str(manifest),
+        'output': output_dir,
+        'force': True,
+        'ignoreGit': True,
+        'ignoreSckan': True,
+        'noPathLayout': True,
+        'silent': True,
+        'logFile': str(Path(output_dir) / 'mapmaker.log'),
+    })
+    maker.make()
+    if maker.flatmap is None:
+        raise RuntimeError(f'Cannot make {manifest}')
+    return maker.flatmap
+
+def flatmap_benchmarks(flatmap: FlatMap, output_dir: str, repeat: int, tile_zoom: int) -> dict[str, dict[str, Any]]:
+#===================================================================================================================
+    results = {}
+    exported_layers = [layer for layer in flatmap.layers if layer.exported]
+
+    def geojson_output():
+        calls = 0
+        for layer in exported_layers:
+            GeoJSONOutput(flatmap, layer, output_dir).save(layer.features)
+            calls += len(layer.features)
+        return calls
+    results['GeoJSONOutput'] = timed(geojson_output, repeat)
+
+    # The features that ``FlatMap`` searches
+    search_features = [f for layer in exported_layers
+                            for f in layer.features
+                                if f.models is not None and 'Polygon' in f.geom_type]
+    def feature_search():
+        feature_search = FeatureSearch(search_features)
+        for feature in search_features:
+            feature_search.features_covering(feature)
+            feature_search.features_inside(feature)
+        return 2*len(search_features)
+    results['FeatureSearch'] = timed(feature_search, repeat)
+
+    svg_raster_layers = [raster_layer for layer in flatmap.layers
+                            for raster_layer in layer.raster_layers
+                                if raster_layer.source_kind == 'svg'
+                               and raster_layer.local_world_to_base is None]
+    tilers = []
+    def svg_tilers():
+        tilers.clear()
+        for raster_layer in svg_raster_layers:
+            tile_set = TileSet(raster_layer.extent, tile_zoom)
+            tilers.append((SVGTiler(raster_layer, tile_set), tile_set))
+        return len(tilers)
+    def svg_tiles():
+        calls = 0
+        for (tiler, tile_set) in tilers:
+            for tile in tile_set:
+                tiler.get_tile(tile)
+                calls += 1
+        return calls
+    if len(svg_raster_layers):
+        results['SVGTiler'] = timed(svg_tilers, repeat)
+        results['SVGTiler.get_tile'] = timed(svg_tiles, repeat)
+    return results
+
+#===============================================================================
+
+def benchmark(tests_directory: Path, manifest: Path|None, repeat: int, tile_zoom: int) -> dict[str, dict[str, Any]]:
+#===================================================================================================================
+    results = svg_path_benchmarks(svg_path_data(tests_directory), repeat)
+    if manifest is not None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            flatmap = make_flatmap(manifest, output_dir)
+            results.update(flatmap_benchmarks(flatmap, output_dir, repeat, tile_zoom))
+    return results
+
+#===============================================================================
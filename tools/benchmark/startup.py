@@ -0,0 +1,99 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019 - 2025  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Benchmark of the startup time of the ``mapmaker`` command, with checks that
+it stays within a time budget and that heavy dependencies aren't imported
+before arguments have been parsed.
+"""
+
+#===============================================================================
+
+import json
+import subprocess
+import sys
+import time
+from typing import Any
+
+#===============================================================================
+
+# Dependencies that are slow to import and only needed when making a map
+HEAVY_MODULES = [
+    'cv2',
+    'networkx',
+    'openpyxl',
+    'pptx',
+    'pyomo',
+    'rdflib',
+    'saxonche',
+    'skia',
+    'svgelements',
+]
+
+# Default budget for ``mapmaker --help`` and ``mapmaker --version``
+STARTUP_BUDGET = 0.5
+
+#===============================================================================
+
+def command_seconds(command: list[str], repeat: int) -> float:
+#============================================================
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    return round(best if best is not None else 0.0, 4)
+
+def heavy_modules_imported() -> list[str]:
+#=========================================
+    """
+    The heavy dependencies imported along with the ``mapmaker`` command.
+    """
+    process = subprocess.run([sys.executable, '-c',
+        'import json, sys; import mapmaker.__main__; '
+        f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))'],
+        capture_output=True, text=True, check=True)
+    return json.loads(process.stdout)
+
+#===============================================================================
+
+def benchmark(repeat: int) -> dict[str, Any]:
+#============================================
+    return {
+        # Starting Python itself puts the other timings into context
+        'python-seconds': command_seconds([sys.executable, '-c', 'pass'], repeat),
+        'version-seconds': command_seconds([sys.executable, '-m', 'mapmaker', '--version'], repeat),
+        'help-seconds': command_seconds([sys.executable, '-m', 'mapmaker', '--help'], repeat),
+        'heavy-modules': heavy_modules_imported(),
+    }
+
+def check_budget(results: dict[str, Any], budget: float) -> list[str]:
+#=====================================================================
+    errors = []
+    for name in ['version-seconds', 'help-seconds']:
+        if results[name] > budget:
+            errors.append(f'Startup {name} of {results[name]} exceeds budget of {budget} seconds')
+    if len(results['heavy-modules']):
+        errors.append(f'Startup imports {", ".join(results["heavy-modules"])}')
+    return errors
+
+#===============================================================================
@@ -0,0 +1,149 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Benchmark of ``make_boundary`` and ``connect_dividers`` over the groups
+of boundary and divider paths found in the SVG sources under ``tests/``.
+
+Element transforms are ignored, so geometries are only approximately those
+of a generated map.
+"""
+
+#===============================================================================
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+
+#===============================================================================
+
+import lxml.etree as etree
+import shapely
+import shapely.ops
+
+#===============================================================================
+
+from mapmaker.geometry import Transform, connect_dividers, extend_line, make_boundary
+from mapmaker.properties.markup import parse_markup
+from mapmaker.sources import WORLD_METRES_PER_PIXEL
+from mapmaker.sources.svg.utils import SVG_TAG, geometry_from_svg_path, parse_svg_path, svg_markup
+
+#===============================================================================
+
+TESTS_DIRECTORY = Path(__file__).parent.parent / 'tests'
+
+SVG_TO_WORLD = Transform([[WORLD_METRES_PER_PIXEL,                       0, 0],
+                          [                     0, -WORLD_METRES_PER_PIXEL, 0],
+                          [                     0,                       0, 1]])
+
+#===============================================================================
+
+@dataclass
+class DividedGroup:
+    name: str
+    boundary_lines: list[shapely.LineString] = field(default_factory=list)
+    boundary_polygon: shapely.Polygon|None = None
+    dividers: list[shapely.LineString] = field(default_factory=list)
+
+def path_geometry(element):
+#==========================
+    if element.tag != SVG_TAG('path') or 'd' not in element.attrib:
+        return None
+    try:
+        return geometry_from_svg_path(list(parse_svg_path(element.attrib['d'])), SVG_TO_WORLD)[0]
+    except ValueError:
+        return None
+
+def svg_divided_groups(svg_file: Path) -> list[DividedGroup]:
+#============================================================
+    groups = []
+    for group_element in etree.parse(str(svg_file)).iter(SVG_TAG('g')):
+        group = DividedGroup(f'{svg_file.name}/{group_element.attrib.get("id", "")}')
+        for element in group_element:
+            if not (markup := svg_markup(element)).startswith('.'):
+                continue
+            properties = parse_markup(markup)
+            if (geometry := path_geometry(element)) is None:
+                continue
+            if properties.get('boundary'):
+                if geometry.geom_type == 'LineString':
+                    group.boundary_lines.append(extend_line(geometry))
+                elif geometry.geom_type == 'Polygon':
+                    group.boundary_polygon = geometry
+            elif properties.get('divider'):
+                if geometry.geom_type == 'LineString':
+                    group.dividers.append(geometry)
+                elif geometry.geom_type == 'Polygon':
+                    group.dividers.append(geometry.boundary)
+        if len(group.boundary_lines) or len(group.dividers):
+            groups.append(group)
+    return groups
+
+#===============================================================================
+
+def benchmark(groups: list[DividedGroup], repeat: int) -> dict[str, float]:
+#==========================================================================
+    timings = {'make_boundary': 0.0, 'connect_dividers': 0.0, 'polygonize': 0.0}
+    for _ in range(repeat):
+        for group in groups:
+            boundary_polygon = group.boundary_polygon
+            if len(group.boundary_lines):
+                start = time.perf_counter()
+                try:
+                    boundary_polygon = make_boundary(list(group.boundary_lines))
+                except ValueError:
+                    pass
+                timings['make_boundary'] += time.perf_counter() - start
+            if boundary_polygon is not None and len(group.dividers):
+                start = time.perf_counter()
+                divider_lines = connect_dividers(group.dividers + [boundary_polygon.boundary], False)
+                timings['connect_dividers'] += time.perf_counter() - start
+                start = time.perf_counter()
+                list(shapely.ops.polygonize(shapely.ops.unary_union(divider_lines)))
+                timings['polygonize'] += time.perf_counter() - start
+    return {name: seconds/repeat for name, seconds in timings.items()}
+
+#===============================================================================
+
+def main():
+#==========
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark boundary and divider processing of test sources.')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Number of times to process all groups (default: 10)')
+    parser.add_argument('--tests', default=str(TESTS_DIRECTORY),
+                        help='Directory containing SVG test sources')
+    args = parser.parse_args()
+
+    groups = []
+    for svg_file in sorted(Path(args.tests).rglob('*.svg')):
+        groups.extend(svg_divided_groups(svg_file))
+    print(f'{len(groups)} groups, {sum(len(group.dividers) for group in groups)} dividers, '
+          f'{sum(len(group.boundary_lines) for group in groups)} boundary lines')
+    for operation, seconds in benchmark(groups, args.repeat).items():
+        print(f'{operation:>16}: {1000*seconds:8.3f} ms per pass')
+
+#===============================================================================
+
+if __name__ == '__main__':
+    main()
+
+#===============================================================================
@@ -0,0 +1,127 @@
+#===============================================================================
+#
+#  Flatmap viewer and annotation tools
+#
+#  Copyright (c) 2019  David Brooks
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#===============================================================================
+
+"""
+Micro-benchmark of ``parse_markup`` over the shape markup found in the SVG
+and Powerpoint sources under ``tests/``.
+"""
+
+#===============================================================================
+
+from pathlib import Path
+import time
+
+#===============================================================================
+
+import lxml.etree as etree
+import pptx
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+#===============================================================================
+
+import mapmaker.properties.markup as markup_module
+from mapmaker.properties.markup import parse_markup
+from mapmaker.sources.svg.utils import svg_markup
+
+#===============================================================================
+
+TESTS_DIRECTORY = Path(__file__).parent.parent / 'tests'
+
+#===============================================================================
+
+def svg_file_markup(svg_file: Path) -> list[str]:
+#================================================
+    markup = []
+    for element in etree.parse(str(svg_file)).iter():
+        if isinstance(element.tag, str) and (text := svg_markup(element)).startswith('.'):
+            markup.append(text)
+    return markup
+
+def pptx_shape_markup(shapes) -> list[str]:
+#==========================================
+    markup = []
+    for shape in shapes:
+        if shape.name.startswith('.'):
+            markup.append(shape.name)
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            markup.extend(pptx_shape_markup(shape.shapes))
+    return markup
+
+def pptx_file_markup(pptx_file: Path) -> list[str]:
+#==================================================
+    markup = []
+    for slide in pptx.Presentation(str(pptx_file)).slides:
+        markup.extend(pptx_shape_markup(slide.shapes))
+    return markup
+
+def test_markup(tests_directory: Path) -> list[str]:
+#===================================================
+    markup = []
+    for svg_file in sorted(tests_directory.rglob('*.svg')):
+        markup.extend(svg_file_markup(svg_file))
+    for pptx_file in sorted(tests_directory.rglob('*.pptx')):
+        markup.extend(pptx_file_markup(pptx_file))
+    return markup
+
+#===============================================================================
+
+def benchmark(markup: list[str], repeat: int) -> dict[str, float]:
+#=================================================================
+    parse_cache = getattr(markup_module, '__parse_markup')
+    timings = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_cache.cache_clear()
+        for text in markup:
+            parse_markup(text)
+    timings['uncached'] = (time.perf_counter() - start)/repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in markup:
+            parse_markup(text)
+    timings['cached'] = (time.perf_counter() - start)/repeat
+    return timings
+
+#===============================================================================
+
+def main():
+#==========
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark parsing of shape markup in test sources.')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Number of times to parse all markup (default: 10)')
+    parser.add_argument('--tests', default=str(TESTS_DIRECTORY),
+                        help='Directory containing SVG and Powerpoint test sources')
+    args = parser.parse_args()
+
+    markup = test_markup(Path(args.tests))
+    print(f'{len(markup)} markup strings, {len(set(markup))} unique')
+    for kind, seconds in benchmark(markup, args.repeat).items():
+        print(f'{kind:>10}: {1000*seconds:8.3f} ms per pass, {1000000*seconds/max(len(markup), 1):6.2f} us per markup')
+
+#===============================================================================
+
+if __name__ == '__main__':
+    main()
+
+#===============================================================================